@@ -1,23 +1,70 @@
-"""Public package surface for Polythene."""
+"""Public package surface for Polythene.
+
+The exports are resolved lazily (:pep:`562`) so ``import polythene`` does not
+load the Cyclopts CLI or Plumbum until an attribute that needs them is first
+accessed.
+"""
 
 from __future__ import annotations
 
-from .isolation import (
-    BACKENDS,
-    CONTAINER_TMP,
-    DEFAULT_STORE,
-    IS_ROOT,
-    VERBOSE,
-    app,
-    cmd_exec,
-    cmd_pull,
-    export_rootfs,
-    generate_uuid,
-    log,
-    main,
-    store_path_for,
-)
-from .session import PolytheneSession
+import importlib
+import typing as typ
+
+if typ.TYPE_CHECKING:
+    from .isolation import (
+        BACKENDS,
+        CONTAINER_TMP,
+        DEFAULT_STORE,
+        IS_ROOT,
+        VERBOSE,
+        app,
+        cmd_exec,
+        cmd_pull,
+        cmd_run,
+        export_rootfs,
+        generate_uuid,
+        log,
+        main,
+        store_path_for,
+    )
+    from .session import PolytheneSession
+
+# Maps each public name to the submodule that defines it.
+_LAZY_EXPORTS: dict[str, str] = {
+    "BACKENDS": "isolation",
+    "CONTAINER_TMP": "isolation",
+    "DEFAULT_STORE": "isolation",
+    "IS_ROOT": "isolation",
+    "VERBOSE": "isolation",
+    "PolytheneSession": "session",
+    "app": "isolation",
+    "cmd_exec": "isolation",
+    "cmd_pull": "isolation",
+    "cmd_run": "isolation",
+    "export_rootfs": "isolation",
+    "generate_uuid": "isolation",
+    "log": "isolation",
+    "main": "isolation",
+    "store_path_for": "isolation",
+}
+
+
+def __getattr__(name: str) -> object:
+    """Import the submodule defining ``name`` on first access and cache it."""
+    try:
+        module_name = _LAZY_EXPORTS[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    value = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Return module attributes including the lazily resolved exports."""
+    return sorted({*globals(), *_LAZY_EXPORTS})
+
 
 __all__ = (
     "BACKENDS",
@@ -29,6 +76,7 @@ __all__ = (
     "app",
     "cmd_exec",
     "cmd_pull",
+    "cmd_run",
     "export_rootfs",
     "generate_uuid",
     "log",
@@ -2,9 +2,15 @@
 
 from __future__ import annotations
 
+import contextvars
 import dataclasses as dc
 import errno
+import functools
 import os
+import shlex
+import subprocess
+import sys
+import threading
 import typing as typ
 from pathlib import Path
 
@@ -12,20 +18,63 @@ from plumbum.commands.base import BaseCommand
 from plumbum.commands.processes import ProcessExecutionError
 
 from .cmd_utils import run_cmd
-from .script_utils import ensure_directory, get_command
+from .script_utils import ensure_directory, find_command, get_command
 
 __all__ = [
     "Backend",
     "BackendContext",
     "BubblewrapUnavailable",
+    "ProbeGroup",
     "create_backends",
     "ensure_runtime_paths",
+    "scan_rootfs",
 ]
 
 
 Logger = typ.Callable[[str], None]
 
 
+@dc.dataclass(slots=True, eq=False)
+class ProbeGroup:
+    """Probe processes launched for one ``exec``, so the losing ones can be killed.
+
+    ``cmd_exec`` probes every candidate backend at once. When a winner is
+    chosen, :meth:`cancel` kills the probes still running and stops new ones
+    from starting, so abandoned probes neither run beside the command nor keep
+    the interpreter alive at exit while their worker threads are joined.
+    """
+
+    cancelled: bool = dc.field(default=False, init=False)
+    _lock: threading.Lock = dc.field(default_factory=threading.Lock, init=False)
+    _running: set[subprocess.Popen[bytes]] = dc.field(default_factory=set, init=False)
+
+    def cancel(self) -> None:
+        """Kill the running probes and refuse any started afterwards."""
+        with self._lock:
+            self.cancelled = True
+            running = tuple(self._running)
+        for proc in running:
+            proc.kill()
+
+    def _register(self, proc: subprocess.Popen[bytes]) -> bool:
+        with self._lock:
+            if self.cancelled:
+                return False
+            self._running.add(proc)
+            return True
+
+    def _discard(self, proc: subprocess.Popen[bytes]) -> None:
+        with self._lock:
+            self._running.discard(proc)
+
+
+# The group of the backend being prepared on the current thread; set by
+# ``Backend.prepare`` so probe helpers need not thread it through every call.
+_ACTIVE_PROBES: contextvars.ContextVar[ProbeGroup | None] = contextvars.ContextVar(
+    "_ACTIVE_PROBES", default=None
+)
+
+
 @dc.dataclass(slots=True, frozen=True)
 class BackendContext:
     """Configuration shared between backend probes and execution."""
@@ -33,9 +82,14 @@ class BackendContext:
     logger: Logger
     timeout: int | None
     container_tmp: Path
+    # Directory names under the rootfs from :func:`scan_rootfs`, shared by the
+    # backends of one ``exec`` so the root is listed once per invocation.
+    root_directories: frozenset[str] | None = None
+    # Lets ``exec`` kill the probes of backends it no longer needs.
+    probes: ProbeGroup | None = None
 
 
-PrepareFn = typ.Callable[[BaseCommand, Path, str], list[str] | None]
+PrepareFn = typ.Callable[[BaseCommand, Path, typ.Sequence[str]], list[str] | None]
 PrepareFactory = typ.Callable[[BackendContext], PrepareFn]
 
 
@@ -50,8 +104,13 @@ _BWRAP_SYSCTL_DISABLED = (
 _BWRAP_PERMISSION_DENIED = "unprivileged user namespaces disabled"
 
 
+@functools.cache
 def _is_privileged_user() -> bool:
-    """Return ``True`` when the current process is allowed privileged actions."""
+    """Return ``True`` when the current process is allowed privileged actions.
+
+    The effective UID does not change over a CLI invocation, so the result is
+    computed once per process.
+    """
     # ``geteuid`` is not available on Windows, but Polythene only targets Linux.
     # Guard in case someone executes the tests elsewhere.
     geteuid = getattr(os, "geteuid", None)
@@ -89,80 +148,173 @@ class Backend:
     ensure_dirs: bool = True
     requires_root: bool = False
 
-    def run(
+    def prepare(
         self,
         root: Path,
-        inner_cmd: str,
+        inner_argv: typ.Sequence[str],
         *,
         context: BackendContext,
-    ) -> tuple[str, int] | None:
-        """Probe and run the backend, returning the chosen name and exit status."""
+    ) -> list[str] | None:
+        """Probe the backend and return its arguments, or ``None`` if unusable.
+
+        Preparation has no side effects beyond probe processes and creating
+        runtime directories, so several backends may be prepared concurrently.
+        ``inner_argv`` is executed directly inside the sandbox rather than
+        through a shell, so its tokens need no quoting.
+        """
         logger = context.logger
-        timeout = context.timeout
-        try:
-            tool = get_command(self.binary)
-        except SystemExit as exc:
-            logger(f"{self.name} unavailable: {exc}")
+        tool = find_command(self.binary)
+        if tool is None:
+            logger(f"{self.name} unavailable: {self.binary} not found")
             return None
 
         if self.ensure_dirs:
-            ensure_runtime_paths(root)
+            ensure_runtime_paths(root, context.root_directories)
 
+        token = _ACTIVE_PROBES.set(context.probes)
         try:
             prepare = self.prepare_factory(context)
-            args = prepare(tool, root, inner_cmd)
+            args = prepare(tool, root, inner_argv)
         except BubblewrapUnavailable as exc:
             logger(str(exc))
             return None
+        finally:
+            _ACTIVE_PROBES.reset(token)
 
-        if args is None:
+        # A cancelled backend was abandoned, not found wanting; stay quiet.
+        if args is None and not (context.probes and context.probes.cancelled):
             logger(f"{self.name} unavailable during preparation")
-            return None
+        return args
+
+    def execute(self, args: typ.Sequence[str], *, context: BackendContext) -> int:
+        """Run the backend with ``args`` from :meth:`prepare` and return its status."""
+        context.logger(f"Executing via {self.name}")
+        tool = get_command(self.binary)
+        result = run_cmd(tool[tuple(args)], fg=True, timeout=context.timeout)
+        return int(typ.cast("typ.SupportsInt", result)) if result is not None else 0
 
-        logger(f"Executing via {self.name}")
-        result = run_cmd(tool[tuple(args)], fg=True, timeout=timeout)
-        exit_code = (
-            int(typ.cast("typ.SupportsInt", result)) if result is not None else 0
+    def run(
+        self,
+        root: Path,
+        inner_argv: typ.Sequence[str],
+        *,
+        context: BackendContext,
+    ) -> tuple[str, int] | None:
+        """Probe and run the backend, returning the chosen name and exit status."""
+        args = self.prepare(root, inner_argv, context=context)
+        if args is None:
+            return None
+        return (self.name, self.execute(args, context=context))
+
+
+def _run_probe(cmd: BaseCommand, *, timeout: int | None) -> None:
+    """Run probe ``cmd`` for its exit status alone.
+
+    Probes are spawned directly with stdin and stdout discarded instead of
+    going through :func:`run_cmd`'s foreground handling. Stderr is captured so
+    permission failures can still be recognised without reaching the terminal.
+
+    Raises
+    ------
+    ProcessExecutionError
+        If the probe exits with a non-zero status.
+    TimeoutError
+        If ``timeout`` seconds elapse first.
+
+    """
+    argv = cmd.formulate()
+    group = _ACTIVE_PROBES.get()
+    if group is not None and group.cancelled:
+        raise ProcessExecutionError(argv, None, "", "probe cancelled")
+    sys.stderr.write(f"$ {' '.join(argv)}\n")
+    proc = cmd.popen(
+        stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE
+    )
+    if group is not None and not group._register(proc):
+        proc.kill()  # cancelled while spawning
+    try:
+        _, stderr = proc.communicate(timeout=timeout)
+    except subprocess.TimeoutExpired as exc:
+        proc.kill()
+        proc.communicate()
+        raise TimeoutError from exc
+    finally:
+        if group is not None:
+            group._discard(proc)
+    if proc.returncode != 0:
+        raise ProcessExecutionError(
+            argv, proc.returncode, "", stderr.decode(errors="replace")
         )
-        return (self.name, exit_code)
 
 
-def ensure_runtime_paths(root: Path) -> None:
-    """Ensure directories required by execution backends exist."""
-    for sub in ("dev", "tmp"):
-        ensure_directory(root / sub)
+_RUNTIME_PATHS = ("dev", "tmp")
+
 
+def scan_rootfs(root: Path) -> frozenset[str] | None:
+    """Return the directory names under ``root``, or ``None`` if it is absent.
 
-def _probe_bwrap_userns(bwrap: BaseCommand, context: BackendContext) -> list[str]:
+    One ``scandir`` serves both as the existence check and as the listing
+    later passed to :func:`ensure_runtime_paths`.
+    """
+    try:
+        with os.scandir(root) as entries:
+            return frozenset(entry.name for entry in entries if entry.is_dir())
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+    except PermissionError:
+        # Unlistable but present; let the backends report the failure.
+        return frozenset() if root.is_dir() else None
+
+
+def ensure_runtime_paths(root: Path, present: frozenset[str] | None = None) -> None:
+    """Ensure directories required by execution backends exist.
+
+    ``present`` is a listing from :func:`scan_rootfs`; when omitted, ``root``
+    is listed afresh.
+    """
+    # Exported images almost always ship both paths, so one directory listing
+    # replaces a ``mkdir`` attempt (and the follow-up ``stat``) per path. The
+    # listing is shared by concurrent probes, so it is only ever read here.
+    if present is None:
+        present = scan_rootfs(root) or frozenset()
+    for sub in _RUNTIME_PATHS:
+        if sub not in present:
+            ensure_directory(root / sub)
+
+
+_BWRAP_USERNS_FLAGS = ("--unshare-user", "--uid", "0", "--gid", "0")
+_BWRAP_NAMESPACE_FLAGS = ("--unshare-pid", "--unshare-ipc", "--unshare-uts")
+_BWRAP_PROC_FLAGS = ("--proc", "/proc")
+
+
+def _check_userns_sysctl(context: BackendContext) -> None:
+    """Raise when the kernel forbids unprivileged user namespaces."""
+    if _is_privileged_user():
+        return
+    try:
+        value = _UNPRIVILEGED_USERNS_PATH.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return
+    except OSError as exc:
+        context.logger(
+            f"Unable to read /proc/sys/kernel/unprivileged_userns_clone: {exc}"
+        )
+        return
+    if value == "0":
+        raise BubblewrapUnavailable(_BWRAP_SYSCTL_DISABLED)
+
+
+def _probe_bwrap_userns(
+    bwrap: BaseCommand, context: BackendContext, *, check_sysctl: bool = True
+) -> list[str]:
     logger = context.logger
     timeout = context.timeout
-    if not _is_privileged_user():
-        try:
-            value = _UNPRIVILEGED_USERNS_PATH.read_text(encoding="utf-8").strip()
-        except FileNotFoundError:
-            pass
-        except OSError as exc:
-            logger(f"Unable to read /proc/sys/kernel/unprivileged_userns_clone: {exc}")
-        else:
-            if value == "0":
-                raise BubblewrapUnavailable(_BWRAP_SYSCTL_DISABLED)
+    if check_sysctl:
+        _check_userns_sysctl(context)
 
     try:
-        run_cmd(
-            bwrap[
-                (
-                    "--unshare-user",
-                    "--uid",
-                    "0",
-                    "--gid",
-                    "0",
-                    "--bind",
-                    "/",
-                    "/",
-                    "true",
-                )
-            ],
-            fg=True,
+        _run_probe(
+            bwrap[(*_BWRAP_USERNS_FLAGS, "--bind", "/", "/", "true")],
             timeout=timeout,
         )
     except (ProcessExecutionError, OSError) as exc:
@@ -171,7 +323,7 @@ def _probe_bwrap_userns(bwrap: BaseCommand, context: BackendContext) -> list[str
         logger(f"User namespace probe failed: {exc}")
         return []
 
-    return ["--unshare-user", "--uid", "0", "--gid", "0"]
+    return list(_BWRAP_USERNS_FLAGS)
 
 
 def _probe_bwrap_proc(
@@ -186,73 +338,75 @@ def _probe_bwrap_proc(
         "--bind",
         str(root),
         "/",
-        "--proc",
-        "/proc",
+        *_BWRAP_PROC_FLAGS,
         "true",
     ]
     try:
-        run_cmd(bwrap[tuple(probe)], fg=True, timeout=timeout)
+        _run_probe(bwrap[tuple(probe)], timeout=timeout)
     except (ProcessExecutionError, SystemExit, OSError):
         return []
-    return ["--proc", "/proc"]
+    return list(_BWRAP_PROC_FLAGS)
 
 
 def make_prepare_bwrap(context: BackendContext) -> PrepareFn:
     timeout = context.timeout
-    container_tmp = context.container_tmp
+    # Converted once per factory rather than on every preparation.
+    container_tmp = str(context.container_tmp)
 
-    def _prepare_bwrap(
-        bwrap: BaseCommand,
-        root: Path,
-        inner_cmd: str,
-    ) -> list[str] | None:
-        base_flags = _probe_bwrap_userns(bwrap, context)
-        base_flags.extend(["--unshare-pid", "--unshare-ipc", "--unshare-uts"])
-        proc_flags = _probe_bwrap_proc(
-            bwrap,
-            base_flags,
-            root,
-            timeout=timeout,
-        )
-        probe_args = [
+    def _template(
+        base_flags: typ.Sequence[str], proc_flags: typ.Sequence[str], root: str
+    ) -> list[str]:
+        # Everything up to the sandboxed command, shared by probe and execution.
+        return [
             *base_flags,
             "--bind",
-            str(root),
+            root,
             "/",
             "--dev-bind",
             "/dev",
             "/dev",
             *proc_flags,
             "--tmpfs",
-            str(container_tmp),
+            container_tmp,
             "--chdir",
             "/",
-            "/bin/sh",
-            "-c",
-            "true",
         ]
+
+    def _probe(bwrap: BaseCommand, template: list[str]) -> bool:
         try:
-            run_cmd(bwrap[tuple(probe_args)], fg=True, timeout=timeout)
+            _run_probe(bwrap[(*template, "/bin/sh", "-c", "true")], timeout=timeout)
         except (ProcessExecutionError, SystemExit, OSError):
-            return None
+            return False
+        return True
 
-        return [
-            *base_flags,
-            "--bind",
-            str(root),
-            "/",
-            "--dev-bind",
-            "/dev",
-            "/dev",
-            *proc_flags,
-            "--tmpfs",
-            str(container_tmp),
-            "--chdir",
-            "/",
-            "/bin/sh",
-            "-c",
-            inner_cmd,
-        ]
+    def _prepare_bwrap(
+        bwrap: BaseCommand,
+        root: Path,
+        inner_argv: typ.Sequence[str],
+    ) -> list[str] | None:
+        # Try the full flag set in a single launch first; hosts that allow it
+        # (the common case) skip the separate user-namespace and /proc probes.
+        _check_userns_sysctl(context)
+        root_s = str(root)
+        full_flags = [*_BWRAP_USERNS_FLAGS, *_BWRAP_NAMESPACE_FLAGS]
+        template = _template(full_flags, _BWRAP_PROC_FLAGS, root_s)
+        if _probe(bwrap, template):
+            template.extend(inner_argv)
+            return template
+
+        base_flags = _probe_bwrap_userns(bwrap, context, check_sysctl=False)
+        base_flags.extend(_BWRAP_NAMESPACE_FLAGS)
+        proc_flags = _probe_bwrap_proc(
+            bwrap,
+            base_flags,
+            root,
+            timeout=timeout,
+        )
+        template = _template(base_flags, proc_flags, root_s)
+        if not _probe(bwrap, template):
+            return None
+        template.extend(inner_argv)
+        return template
 
     return _prepare_bwrap
 
@@ -263,14 +417,15 @@ def make_prepare_proot(context: BackendContext) -> PrepareFn:
     def _prepare_proot(
         proot: BaseCommand,
         root: Path,
-        inner_cmd: str,
+        inner_argv: typ.Sequence[str],
     ) -> list[str] | None:
-        probe_args = ["-R", str(root), "-0", "/bin/sh", "-c", "true"]
+        template = ["-R", str(root), "-0"]
         try:
-            run_cmd(proot[tuple(probe_args)], fg=True, timeout=timeout)
+            _run_probe(proot[(*template, "/bin/sh", "-c", "true")], timeout=timeout)
         except (ProcessExecutionError, SystemExit, OSError):
             return None
-        return ["-R", str(root), "-0", "/bin/sh", "-c", inner_cmd]
+        template.extend(inner_argv)
+        return template
 
     return _prepare_proot
 
@@ -281,18 +436,20 @@ def make_prepare_chroot(context: BackendContext) -> PrepareFn:
     def _prepare_chroot(
         chroot: BaseCommand,
         root: Path,
-        inner_cmd: str,
+        inner_argv: typ.Sequence[str],
     ) -> list[str] | None:
-        probe_args = [str(root), "/bin/sh", "-c", "true"]
+        root_s = str(root)
         try:
-            run_cmd(chroot[tuple(probe_args)], fg=True, timeout=timeout)
+            _run_probe(chroot[root_s, "/bin/sh", "-c", "true"], timeout=timeout)
         except (ProcessExecutionError, SystemExit, OSError):
             return None
+        # chroot inherits the host's PATH, so a shell resets it to the
+        # rootfs's standard directories before running the command.
         return [
-            str(root),
+            root_s,
             "/bin/sh",
             "-lc",
-            f"export PATH=/bin:/sbin:/usr/bin:/usr/sbin; {inner_cmd}",
+            f"export PATH=/bin:/sbin:/usr/bin:/usr/sbin; {shlex.join(inner_argv)}",
         ]
 
     return _prepare_chroot
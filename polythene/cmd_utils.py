@@ -12,6 +12,7 @@ Examples
 
 from __future__ import annotations
 
+import functools
 import sys
 import typing as typ
 
@@ -30,46 +31,62 @@ class TimeoutConflictError(TypeError):
         super().__init__("timeout specified via parameter and run_kwargs")
 
 
-@typ.runtime_checkable
-class SupportsFormulate(typ.Protocol):
-    """Objects that expose a shell representation via ``formulate``."""
+if typ.TYPE_CHECKING:
+    # The protocols only describe commands for the type checker. ``run_cmd``
+    # detects capabilities via ``_capabilities`` because runtime-checkable
+    # protocol ``isinstance`` checks re-inspect every member on each call.
+
+    class SupportsFormulate(typ.Protocol):
+        """Objects that expose a shell representation via ``formulate``."""
+
+        def formulate(self) -> cabc.Sequence[str]: ...
+
+        def __call__(self, *args: object, **run_kwargs: object) -> object: ...
+
+    class SupportsRun(typ.Protocol):
+        """Commands that support ``run`` with keyword arguments."""
 
-    def formulate(self) -> cabc.Sequence[str]:  # pragma: no cover - protocol
-        ...
+        def run(self, *args: object, **run_kwargs: object) -> object: ...
 
-    def __call__(
-        self, *args: object, **run_kwargs: object
-    ) -> object:  # pragma: no cover - protocol
-        ...
+    class SupportsRunFg(typ.Protocol):
+        """Commands that expose ``run_fg`` for foreground execution."""
 
+        def run_fg(self, **run_kwargs: object) -> object: ...
 
-@typ.runtime_checkable
-class SupportsRun(typ.Protocol):
-    """Commands that support ``run`` with keyword arguments."""
+    class SupportsAnd(typ.Protocol):
+        """Commands that implement ``cmd & FG`` semantics."""
 
-    def run(
-        self, *args: object, **run_kwargs: object
-    ) -> object:  # pragma: no cover - protocol
-        ...
+        def __and__(self, other: object) -> object: ...
 
+    Command = SupportsFormulate
 
-@typ.runtime_checkable
-class SupportsRunFg(typ.Protocol):
-    """Commands that expose ``run_fg`` for foreground execution."""
 
-    def run_fg(self, **run_kwargs: object) -> object:  # pragma: no cover - protocol
-        ...
+class _Capabilities(typ.NamedTuple):
+    """Execution entry points offered by a command type."""
 
+    formulate: bool
+    run: bool
+    run_fg: bool
+    and_fg: bool
 
-@typ.runtime_checkable
-class SupportsAnd(typ.Protocol):
-    """Commands that implement ``cmd & FG`` semantics."""
 
-    def __and__(self, other: object) -> object:  # pragma: no cover - protocol
-        ...
+_CAPABILITIES_CACHE: dict[type, _Capabilities] = {}
 
 
-Command = SupportsFormulate
+def _capabilities(cmd: object) -> _Capabilities:
+    """Return the cached capabilities of ``type(cmd)``."""
+    cmd_type = type(cmd)
+    caps = _CAPABILITIES_CACHE.get(cmd_type)
+    if caps is None:
+        caps = _Capabilities(
+            formulate=hasattr(cmd_type, "formulate"),
+            run=hasattr(cmd_type, "run"),
+            run_fg=hasattr(cmd_type, "run_fg"),
+            and_fg=hasattr(cmd_type, "__and__"),
+        )
+        _CAPABILITIES_CACHE[cmd_type] = caps
+    return caps
+
 
 KwargDict = dict[str, object]
 
@@ -84,6 +101,28 @@ def _merge_timeout(timeout: float | None, run_kwargs: KwargDict) -> float | None
     return timeout
 
 
+# Plumbum is imported on first use rather than at module scope so importing
+# this module stays cheap; the accessors make later lookups a cache hit.
+
+
+@functools.cache
+def _process_timed_out() -> type[Exception]:
+    """Return plumbum's ``ProcessTimedOut`` exception type."""
+    from plumbum.commands.processes import (  # pyright: ignore[reportMissingTypeStubs]
+        ProcessTimedOut,
+    )
+
+    return ProcessTimedOut
+
+
+@functools.cache
+def _foreground_modifier() -> object:
+    """Return plumbum's ``FG`` execution modifier."""
+    from plumbum import FG  # pyright: ignore[reportMissingTypeStubs]
+
+    return FG
+
+
 def run_cmd(
     cmd: Command,
     *,
@@ -92,35 +131,33 @@ def run_cmd(
     **run_kwargs: object,
 ) -> object:
     """Execute ``cmd`` while echoing it to stderr."""
-    timeout = _merge_timeout(timeout, run_kwargs)
-    if not isinstance(cmd, SupportsFormulate):
+    if run_kwargs:  # the common call shapes pass no extra keyword arguments
+        timeout = _merge_timeout(timeout, run_kwargs)
+    caps = _capabilities(cmd)
+    if not caps.formulate:
         msg = "Command must be a plumbum invocation or pipeline"
         raise TypeError(msg)
 
-    print(f"$ {cmd}", file=sys.stderr)
+    # ``formulate`` is what plumbum's ``__str__`` joins; call it directly and
+    # emit the echo with a single write.
+    sys.stderr.write(f"$ {' '.join(cmd.formulate())}\n")
     if fg:
         if timeout is not None:
-            if not isinstance(cmd, SupportsRun):
+            if not caps.run:
                 msg = "Command does not support timeout execution"
                 raise TypeError(msg)
             run_kwargs.setdefault("stdout", None)
             run_kwargs.setdefault("stderr", None)
-            from plumbum.commands.processes import (  # pyright: ignore[reportMissingTypeStubs]
-                ProcessTimedOut,
-            )
-
             try:
-                cmd.run(timeout=timeout, **run_kwargs)
-            except ProcessTimedOut as exc:
+                typ.cast("SupportsRun", cmd).run(timeout=timeout, **run_kwargs)
+            except _process_timed_out() as exc:
                 raise TimeoutError from exc
             return 0
-        if isinstance(cmd, SupportsRunFg):
-            cmd.run_fg(**run_kwargs)
+        if caps.run_fg:
+            typ.cast("SupportsRunFg", cmd).run_fg(**run_kwargs)
             return 0
-        if isinstance(cmd, SupportsAnd) and not run_kwargs:
-            from plumbum import FG  # pyright: ignore[reportMissingTypeStubs]
-
-            return cmd & FG
+        if caps.and_fg and not run_kwargs:
+            return typ.cast("SupportsAnd", cmd) & _foreground_modifier()
         if run_kwargs:
             msg = (
                 "Command does not support foreground execution with keyword arguments: "
@@ -131,15 +168,15 @@ def run_cmd(
         return result if isinstance(result, int) else 0
 
     if timeout is not None:
-        if isinstance(cmd, SupportsRun):
+        if caps.run:
             run_kwargs.setdefault("timeout", timeout)
         else:
             msg = "Command does not support timeout execution"
             raise TypeError(msg)
 
     if run_kwargs:
-        if isinstance(cmd, SupportsRun):
-            return cmd.run(**run_kwargs)
+        if caps.run:
+            return typ.cast("SupportsRun", cmd).run(**run_kwargs)
         msg = f"Command does not accept keyword arguments: {sorted(run_kwargs.keys())}"
         raise TypeError(msg)
     return cmd()
@@ -3,10 +3,13 @@
 from __future__ import annotations
 
 import contextlib
+import functools
 import os
-import shlex
+import signal
 import sys
+import tarfile
 import tempfile
+import threading
 import time
 import typing as typ
 from collections import abc as cabc
@@ -14,27 +17,89 @@ from pathlib import Path
 
 import cyclopts
 from cyclopts import App, Parameter
-from plumbum.commands.processes import ProcessExecutionError
-from uuid6 import uuid7
 
-from .backends import Backend, BackendContext, create_backends, ensure_runtime_paths
-from .script_utils import ensure_directory, get_command, run_cmd
+from .script_utils import ensure_directory, find_command, get_command, run_cmd
+
+if typ.TYPE_CHECKING:
+    from plumbum.commands.base import BaseCommand
+
+    from .backends import Backend
+
+    BACKENDS: tuple[Backend, ...]
+    CONTAINER_TMP: Path
+    DEFAULT_STORE: Path
+    IS_ROOT: bool
+
+# Plumbum and the backend registry are imported inside the functions
+# that need them so that importing this module (for example via
+# ``PolytheneSession``) does not pay for them up front.
 
 # -------------------- Configuration --------------------
 
-CONTAINER_TMP = Path(tempfile.gettempdir())
-BACKENDS: tuple[Backend, ...] = create_backends()
-_DEFAULT_STORE_FALLBACK = Path(tempfile.gettempdir()) / "polythene"
-DEFAULT_STORE = Path(
-    os.environ.get("POLYTHENE_STORE", str(_DEFAULT_STORE_FALLBACK))
-).resolve()
 VERBOSE = bool(os.environ.get("POLYTHENE_VERBOSE"))
 
-IS_ROOT = os.geteuid() == 0
-
 # Make Podman as “quiet and simple” as possible for nested/sandboxed execution.
-os.environ.setdefault("CONTAINERS_STORAGE_DRIVER", "vfs")
-os.environ.setdefault("CONTAINERS_EVENTS_BACKEND", "file")
+# Applied to the Podman commands only, and only when the caller has not
+# chosen a value, rather than mutating ``os.environ`` on import.
+_PODMAN_ENV_DEFAULTS = {
+    "CONTAINERS_STORAGE_DRIVER": "vfs",
+    "CONTAINERS_EVENTS_BACKEND": "file",
+}
+
+
+@functools.cache
+def default_store() -> Path:
+    """Return the store from ``POLYTHENE_STORE`` or the temporary directory."""
+    fallback = Path(tempfile.gettempdir()) / "polythene"
+    return Path(os.environ.get("POLYTHENE_STORE", str(fallback))).resolve()
+
+
+@functools.cache
+def container_tmp() -> Path:
+    """Return the path mounted as a private tmpfs inside the sandbox."""
+    return Path(tempfile.gettempdir())
+
+
+@functools.cache
+def is_root() -> bool:
+    """Return ``True`` when the CLI runs with an effective UID of 0."""
+    return os.geteuid() == 0
+
+
+@functools.cache
+def get_backends() -> tuple[Backend, ...]:
+    """Return the execution backends in priority order, creating them once."""
+    from .backends import create_backends
+
+    return create_backends()
+
+
+_LAZY_CONSTANTS: dict[str, typ.Callable[[], object]] = {
+    "BACKENDS": get_backends,
+    "CONTAINER_TMP": container_tmp,
+    "DEFAULT_STORE": default_store,
+    "IS_ROOT": is_root,
+}
+
+
+def __getattr__(name: str) -> object:
+    """Resolve the former configuration constants through their accessors."""
+    try:
+        accessor = _LAZY_CONSTANTS[name]
+    except KeyError:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg) from None
+    return accessor()
+
+
+def _podman_env() -> dict[str, str]:
+    """Return the Podman tuning variables not already set by the caller."""
+    return {
+        key: value
+        for key, value in _PODMAN_ENV_DEFAULTS.items()
+        if key not in os.environ
+    }
+
 
 app = App()
 app.help = "polythene — Temu podman for Codex"
@@ -51,11 +116,14 @@ UuidArgument = typ.Annotated[
     str, Parameter(help="UUID of the exported filesystem (from `polythene pull`)")
 ]
 StoreOption = typ.Annotated[
-    Path,
+    Path | None,
     Parameter(
         alias=["-s", "--store"],
         env_var="POLYTHENE_STORE",
-        help="Directory to store UUID rootfs trees",
+        help=(
+            "Directory to store UUID rootfs trees "
+            "(defaults to $TMPDIR/polythene when unset)"
+        ),
     ),
 ]
 TimeoutOption = typ.Annotated[
@@ -97,10 +165,26 @@ def _normalize_command_args(cmd: tuple[CommandToken, ...]) -> list[str]:
     return _coerce_command_tokens(cmd)
 
 
+def _command_tokens(cmd: tuple[CommandToken, ...]) -> list[str]:
+    """Return ``cmd`` as argv tokens, exiting with status 2 when unusable.
+
+    The tokens follow the backend's own options directly, so a leading ``-``
+    would be parsed by ``bwrap`` or ``proot`` as an option of theirs.
+    """
+    tokens = _normalize_command_args(cmd) if cmd else []
+    if not tokens:
+        _error("No command provided")
+        raise SystemExit(2)
+    if tokens[0].startswith("-"):
+        _error(f"Command must start with a program, not an option: {tokens[0]}")
+        raise SystemExit(2)
+    return tokens
+
+
 IsolationName = typ.Literal["bubblewrap", "proot", "chroot"]
-ISOLATION_NAMES: tuple[IsolationName, ...] = typ.cast(
-    "tuple[IsolationName, ...]", typ.get_args(IsolationName)
-)
+# Spelled out rather than derived via ``typ.get_args`` to keep import cheap;
+# the test suite checks the two stay in step.
+ISOLATION_NAMES: tuple[IsolationName, ...] = ("bubblewrap", "proot", "chroot")
 IsolationOption = typ.Annotated[
     IsolationName | None,
     Parameter(
@@ -129,27 +213,253 @@ def _normalize_retcode(retcode: int | None) -> int:
 def log(msg: str) -> None:
     """Print ``msg`` to stderr with a timestamp when verbose mode is enabled."""
     if VERBOSE:
-        ts = time.strftime("%H:%M:%S")
-        print(f"[{ts}] {msg}", file=sys.stderr)
+        # Integer fields skip ``strftime``'s locale handling, and a single
+        # ``write`` avoids ``print`` emitting the newline separately.
+        now = time.localtime()
+        sys.stderr.write(
+            f"[{now.tm_hour:02d}:{now.tm_min:02d}:{now.tm_sec:02d}] {msg}\n"
+        )
 
 
 def store_path_for(uuid: str, store: Path) -> Path:
-    """Return the absolute path for ``uuid`` under ``store``."""
-    return (store / uuid).resolve()
+    """Return the absolute path for ``uuid`` under ``store``.
+
+    The path is normalised lexically rather than with :meth:`Path.resolve`,
+    which would ``lstat`` every component on each ``exec``; sandboxes bind the
+    path as given, so symlinks in ``store`` need not be expanded.
+    """
+    path = store / uuid
+    if not path.is_absolute():
+        path = Path.cwd() / path
+    return Path(os.path.normpath(path))
 
 
 def generate_uuid() -> str:
-    """Generate a UUID for a new root filesystem."""
-    return str(uuid7())
+    """Generate a time-ordered UUIDv7 (RFC 9562) for a new root filesystem.
+
+    The 16 bytes are assembled directly (48-bit millisecond timestamp followed
+    by random bits) and formatted once, avoiding a UUID object per call.
+    """
+    timestamp_ms = time.time_ns() // 1_000_000
+    raw = bytearray(timestamp_ms.to_bytes(6, "big") + os.urandom(10))
+    raw[6] = 0x70 | (raw[6] & 0x0F)  # version 7
+    raw[8] = 0x80 | (raw[8] & 0x3F)  # RFC 9562 variant
+    text = raw.hex()
+    return f"{text[:8]}-{text[8:12]}-{text[12:16]}-{text[16:20]}-{text[20:]}"
 
 
 # -------------------- Image export (“pull”) --------------------
 
 
+# Read size for the export stream; tarfile's default 10 KiB records cost a
+# ``read`` syscall every few members on multi-gigabyte exports.
+_EXPORT_BUFSIZE = 1 << 20
+
+
+def _widen_pipe(stream: typ.IO[bytes]) -> None:
+    """Grow the kernel buffer of ``stream``'s pipe so the exporter runs ahead.
+
+    This is the in-process equivalent of an ``mbuffer`` stage: Podman can keep
+    writing while the extractor is blocked on disk. Failure (non-Linux, or a
+    size above ``/proc/sys/fs/pipe-max-size``) leaves the default in place.
+    """
+    import fcntl
+
+    set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+    if set_pipe_size is None:
+        return
+    with contextlib.suppress(OSError, ValueError):
+        fcntl.fcntl(stream.fileno(), set_pipe_size, _EXPORT_BUFSIZE)
+
+
+def _is_within(root: Path, candidate: Path) -> bool:
+    """Return ``True`` when ``candidate`` resolves to a path inside ``root``."""
+    return candidate.resolve().is_relative_to(root)
+
+
+def _rootfs_member_filter(
+    member: tarfile.TarInfo, _dest: str, *, root: Path
+) -> tarfile.TarInfo | None:
+    """Admit ``member`` with its modes intact unless it would escape ``root``.
+
+    The stock ``tar`` and ``data`` filters strip setuid bits and the sticky bit
+    on ``/tmp``, which a root filesystem needs, so this filter keeps every
+    archived mode bit and, unlike GNU tar without root, ignores the umask.
+    Leading slashes are dropped and paths (or hard-link targets) that resolve
+    outside ``root`` are refused. Device nodes are skipped for
+    unprivileged users, who cannot create them and whose sandboxes bind the
+    host ``/dev`` regardless. ``root`` is the pre-resolved destination so it
+    is not re-resolved for every member.
+    """
+    if (member.ischr() or member.isblk()) and not is_root():
+        return None
+    name = member.name.lstrip("/")
+    if not _is_within(root, root / name):
+        raise tarfile.OutsideDestinationError(member, str(root / name))
+    if member.islnk():
+        target = root / member.linkname.lstrip("/")
+        if not _is_within(root, target):
+            raise tarfile.LinkOutsideDestinationError(member, str(target))
+    return member if name == member.name else member.replace(name=name, deep=False)
+
+
+def _stream_export(
+    export: BaseCommand, dest: Path, *, timeout: int | None = None
+) -> None:
+    """Extract the tar stream written by ``export`` into ``dest`` in-process.
+
+    Raises
+    ------
+    TimeoutError
+        If ``timeout`` seconds elapse before the export finishes.
+    ProcessExecutionError
+        If the export command exits with a non-zero status.
+
+    """
+    from plumbum.commands.processes import ProcessExecutionError
+
+    print(f"$ {export} | <extract to {dest}>", file=sys.stderr)
+    proc = export.popen(stdin=None, stderr=None)
+    _widen_pipe(proc.stdout)
+    expired = threading.Event()
+
+    def _expire() -> None:
+        expired.set()
+        proc.kill()
+
+    timer = threading.Timer(timeout, _expire) if timeout is not None else None
+    if timer is not None:
+        timer.start()
+    read_error: tarfile.ReadError | None = None
+    try:
+        with tarfile.open(
+            fileobj=proc.stdout, mode="r|", bufsize=_EXPORT_BUFSIZE
+        ) as archive:
+            archive.extractall(  # noqa: S202 - members are vetted by the filter
+                dest,
+                numeric_owner=True,
+                filter=functools.partial(_rootfs_member_filter, root=dest.resolve()),
+            )
+    except tarfile.ReadError as exc:
+        read_error = exc
+    finally:
+        if timer is not None:
+            timer.cancel()
+        # Close our end before waiting: an exporter still writing into a full
+        # pipe would otherwise block forever, whereas now it exits on SIGPIPE.
+        proc.stdout.close()
+        retcode = proc.wait()
+
+    if expired.is_set():
+        raise TimeoutError
+    # A truncated stream usually means the exporter died, so report that rather
+    # than the archive error it caused; a SIGPIPE after a bad stream is our own
+    # doing, and the archive error is the real cause.
+    if retcode and not (read_error is not None and retcode == -signal.SIGPIPE):
+        raise ProcessExecutionError(export.formulate(), retcode, "", "")
+    if read_error is not None:
+        raise read_error
+
+
+def _write_metadata(dest: Path, image: str) -> None:
+    """Record ``image`` and the export time in ``dest/.polythene-meta``.
+
+    Best-effort: the file is informational only, so write failures are
+    ignored. A raw descriptor avoids building a text-mode file object for a
+    payload of a few dozen bytes.
+    """
+    timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
+    payload = f"image={image}\ncreated={timestamp}\n".encode()
+    # A plain ``try`` avoids the context manager that ``contextlib.suppress``
+    # sets up on every call.
+    try:
+        fd = os.open(
+            dest / ".polythene-meta", os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644
+        )
+        try:
+            os.write(fd, payload)
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def _parallel_copy_args() -> list[str]:
+    """Return skopeo flags bounding concurrent layer downloads, if configured.
+
+    ``POLYTHENE_MAX_CONCURRENT_DOWNLOADS`` maps onto skopeo's
+    ``--image-parallel-copies``; unset or invalid values keep skopeo's own
+    default.
+    """
+    raw = os.environ.get("POLYTHENE_MAX_CONCURRENT_DOWNLOADS")
+    if raw is None:
+        return []
+    try:
+        limit = int(raw)
+    except ValueError:
+        limit = 0
+    if limit < 1:
+        log(f"Ignoring invalid POLYTHENE_MAX_CONCURRENT_DOWNLOADS={raw!r}")
+        return []
+    return ["--image-parallel-copies", str(limit)]
+
+
+def _export_via_skopeo(image: str, dest: Path, *, timeout: int | None = None) -> bool:
+    """Unpack ``image`` into ``dest`` with skopeo and umoci, bypassing Podman.
+
+    Returns ``False``, leaving ``dest`` absent, when either tool is missing or
+    the copy fails so the caller can fall back to Podman.
+
+    Raises
+    ------
+    FileExistsError
+        If ``dest`` already exists.
+
+    """
+    from plumbum.commands.processes import ProcessExecutionError
+
+    skopeo = find_command("skopeo")
+    umoci = find_command("umoci")
+    if skopeo is None or umoci is None:
+        return False
+    if dest.exists():
+        raise FileExistsError(dest)
+
+    source = image if "://" in image else f"docker://{image}"
+    # Stage next to ``dest`` so the final rename never crosses filesystems.
+    ensure_directory(dest.parent)
+    with tempfile.TemporaryDirectory(prefix=".polythene-oci-", dir=dest.parent) as work:
+        layout = f"{Path(work) / 'layout'}:latest"
+        bundle = Path(work) / "bundle"
+        copy = ["copy", "--quiet", *_parallel_copy_args(), source, f"oci:{layout}"]
+        unpack = ["unpack", "--image", layout, str(bundle)]
+        if not is_root():
+            unpack.insert(1, "--rootless")
+        log(f"Copying {image} via skopeo …")
+        try:
+            run_cmd(skopeo[tuple(copy)], fg=True, timeout=timeout)
+            run_cmd(umoci[tuple(unpack)], fg=True, timeout=timeout)
+        except ProcessExecutionError as exc:
+            log(f"skopeo export failed, falling back to podman: {exc}")
+            return False
+        (bundle / "rootfs").rename(dest)
+    return True
+
+
 def export_rootfs(image: str, dest: Path, *, timeout: int | None = None) -> None:
-    """Export a container image filesystem to dest/ via podman create+export."""
-    podman = get_command("podman")
-    tar = get_command("tar")
+    """Export a container image filesystem to dest/.
+
+    ``skopeo`` and ``umoci`` are preferred when both are installed, as they
+    fetch and unpack the image without a container engine; otherwise the
+    image is pulled with Podman and exported from a stopped container.
+    """
+    from plumbum.commands.processes import ProcessExecutionError
+
+    if _export_via_skopeo(image, dest, timeout=timeout):
+        _write_metadata(dest, image)
+        return
+
+    podman = get_command("podman").with_env(**_podman_env())
 
     # Pull explicitly (keeps exec fully offline later)
     log(f"Pulling {image} …")
@@ -176,25 +486,14 @@ def export_rootfs(image: str, dest: Path, *, timeout: int | None = None) -> None
         raise SystemExit(_normalize_retcode(exc.retcode)) from exc
     try:
         log(f"Exporting rootfs of {cid} → {dest}")
-        # Pipe: podman export CID | tar -C dest -x
-        # plumbum pipes stream in FG without buffering the whole archive
-        run_cmd(
-            (podman["export", cid] | tar["-C", str(dest), "-x"]),
-            fg=True,
-            timeout=timeout,
-        )
+        # The archive streams straight from podman's stdout into tarfile, so
+        # no external tar process or intermediate file is involved.
+        _stream_export(podman["export", cid], dest, timeout=timeout)
     finally:
         with contextlib.suppress(ProcessExecutionError):
             run_cmd(podman["rm", cid], fg=True, timeout=timeout)
 
-    # Metadata (best-effort, does not affect functionality)
-    meta = dest / ".polythene-meta"
-    with contextlib.suppress(Exception):
-        timestamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
-        meta.write_text(
-            f"image={image}\ncreated={timestamp}\n",
-            encoding="utf-8",
-        )
+    _write_metadata(dest, image)
 
 
 # -------------------- CLI commands --------------------
@@ -204,10 +503,14 @@ def export_rootfs(image: str, dest: Path, *, timeout: int | None = None) -> None
 def cmd_pull(
     image: ImageArgument,
     *,
-    store: StoreOption = DEFAULT_STORE,
+    store: StoreOption = None,
     timeout: TimeoutOption = None,
 ) -> None:
     """Pull IMAGE, export it into STORE/UUID, and print the UUID."""
+    from .backends import ensure_runtime_paths
+
+    if store is None:
+        store = default_store()
     ensure_directory(store)
     uid = generate_uuid()
     root = store_path_for(uid, store)
@@ -225,83 +528,135 @@ def cmd_pull(
     print(uid)
 
 
+def _prioritise_backends(
+    backends: tuple[Backend, ...], preferred: str | None
+) -> tuple[Backend, ...] | None:
+    """Move the backend named ``preferred`` to the front in a single scan.
+
+    Returns ``None`` when no backend carries that name.
+    """
+    if preferred is None:
+        return backends
+    for index, backend in enumerate(backends):
+        if backend.name == preferred:
+            return (backend, *backends[:index], *backends[index + 1 :])
+    return None
+
+
 @app.command(name="exec")
 def cmd_exec(
     uuid: UuidArgument,
     *cmd: CommandToken,
-    store: StoreOption = DEFAULT_STORE,
+    store: StoreOption = None,
     timeout: TimeoutOption = None,
     isolation: IsolationOption = None,
 ) -> None:
     """Run ``CMD`` inside the UUID's rootfs with configurable backend priority."""
-    if not cmd:
-        _error("No command provided")
-        raise SystemExit(2)
+    from concurrent.futures import ThreadPoolExecutor
 
+    from plumbum.commands.processes import ProcessExecutionError
+
+    from .backends import BackendContext, ProbeGroup, scan_rootfs
+
+    tokens = _command_tokens(cmd)
+
+    if store is None:
+        store = default_store()
     root = store_path_for(uuid, store)
-    if not root.is_dir():
+    root_directories = scan_rootfs(root)
+    if root_directories is None:
         _error(f"No such UUID rootfs: {uuid} ({root})")
         raise SystemExit(1)
 
-    tokens = _normalize_command_args(cmd)
-    inner_cmd = " ".join(shlex.quote(x) for x in tokens)
-
-    selected_backends = BACKENDS
-    if isolation is not None:
-        backends_by_name = {backend.name: backend for backend in BACKENDS}
-        try:
-            preferred = backends_by_name[isolation]
-        except KeyError:
-            _error(f"Unsupported isolation backend requested: {isolation}")
-            raise SystemExit(2) from None
-        remaining = [backend for backend in BACKENDS if backend is not preferred]
-        selected_backends = (preferred, *remaining)
-
-    def _next_available_backend(start: int) -> Backend | None:
-        for candidate in selected_backends[start:]:
-            if candidate.requires_root and not IS_ROOT:
-                continue
-            return candidate
-        return None
-
-    current_isolation = isolation
+    selected_backends = _prioritise_backends(get_backends(), isolation)
+    if selected_backends is None:
+        _error(f"Unsupported isolation backend requested: {isolation}")
+        raise SystemExit(2)
 
+    candidates = tuple(
+        backend
+        for backend in selected_backends
+        if not (backend.requires_root and not is_root())
+    )
+    probes = ProbeGroup()
     context = BackendContext(
         logger=log,
         timeout=timeout,
-        container_tmp=CONTAINER_TMP,
+        container_tmp=container_tmp(),
+        root_directories=root_directories,
+        probes=probes,
     )
 
-    for index, backend in enumerate(selected_backends):
-        if backend.requires_root and not IS_ROOT:
-            continue
-        try:
-            outcome = backend.run(
-                root,
-                inner_cmd,
-                context=context,
-            )
-        except ProcessExecutionError as exc:
-            raise SystemExit(_normalize_retcode(exc.retcode)) from exc
-        if outcome is None:
-            next_backend = _next_available_backend(index + 1)
-            if next_backend is not None:
-                source = current_isolation or backend.name
+    def _prepare(backend: Backend) -> list[str] | None:
+        return backend.prepare(root, tokens, context=context)
+
+    # Probe every candidate at once so an unusable preferred backend does not
+    # delay its fallbacks; the first usable one in priority order still wins.
+    selected: tuple[Backend, list[str]] | None = None
+    current_isolation = isolation
+    pool = ThreadPoolExecutor(max_workers=max(len(candidates), 1))
+    try:
+        prepared = [pool.submit(_prepare, backend) for backend in candidates]
+        for index, (backend, future) in enumerate(
+            zip(candidates, prepared, strict=True)
+        ):
+            args = future.result()
+            if args is not None:
+                selected = (backend, args)
+                break
+            source = current_isolation or backend.name
+            if index + 1 < len(candidates):
+                next_backend = candidates[index + 1]
                 log(f"{source} unavailable: falling back to {next_backend.name}")
                 current_isolation = next_backend.name
             else:
                 log(f"{backend.name} unavailable and no further backends remain")
-            continue
+    finally:
+        # Kill the probes of backends that lost, so they neither run beside the
+        # command nor keep the worker threads, which are joined at interpreter
+        # exit, alive after it finishes.
+        probes.cancel()
+        pool.shutdown(wait=False, cancel_futures=True)
 
-        name, rc = outcome
-        current_isolation = name
-        if rc is not None:
-            if rc == 0:
-                return
-            raise SystemExit(rc)
+    if selected is None:
+        _error("All isolation modes unavailable (bwrap/proot/chroot).")
+        raise SystemExit(126)
 
-    _error("All isolation modes unavailable (bwrap/proot/chroot).")
-    raise SystemExit(126)
+    backend, args = selected
+    try:
+        rc = backend.execute(args, context=context)
+    except ProcessExecutionError as exc:
+        raise SystemExit(_normalize_retcode(exc.retcode)) from exc
+    if rc != 0:
+        raise SystemExit(rc)
+
+
+@app.command(name="run")
+def cmd_run(
+    image: ImageArgument,
+    *cmd: CommandToken,
+    store: StoreOption = None,
+    timeout: TimeoutOption = None,
+    isolation: IsolationOption = None,
+) -> None:
+    """Export IMAGE to a throwaway rootfs, run ``CMD`` inside it, then remove it."""
+    from .backends import ensure_runtime_paths
+
+    _command_tokens(cmd)  # reject unusable commands before exporting
+
+    if store is None:
+        store = default_store()
+    ensure_directory(store)
+    # Stage inside the store so exports land on the same filesystem as
+    # persistent ones; the directory is removed even when ``CMD`` fails.
+    with tempfile.TemporaryDirectory(
+        prefix=".polythene-run-", dir=store, ignore_cleanup_errors=True
+    ) as work:
+        run_store = Path(work)
+        root = store_path_for("rootfs", run_store)
+        export_rootfs(image, root, timeout=timeout)
+        ensure_runtime_paths(root)
+        cmd_exec("rootfs", *cmd, store=run_store, timeout=timeout, isolation=isolation)
 
 
 def main(argv: typ.Sequence[str] | None = None) -> None:
@@ -322,8 +677,13 @@ __all__ = (
     "app",
     "cmd_exec",
     "cmd_pull",
+    "cmd_run",
+    "container_tmp",
+    "default_store",
     "export_rootfs",
     "generate_uuid",
+    "get_backends",
+    "is_root",
     "log",
     "main",
     "store_path_for",
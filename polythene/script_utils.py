@@ -2,12 +2,11 @@
 
 from __future__ import annotations
 
+import functools
 import sys
 import typing as typ
 from pathlib import Path
 
-from plumbum import local
-
 from .cmd_utils import run_cmd
 
 if typ.TYPE_CHECKING:
@@ -17,6 +16,7 @@ __all__ = [
     "PKG_DIR",
     "ensure_directory",
     "ensure_exists",
+    "find_command",
     "get_command",
     "run_cmd",
     "unique_match",
@@ -33,13 +33,39 @@ def _abort(message: str, *, code: int) -> typ.NoReturn:
     raise SystemExit(code)
 
 
+@functools.cache
+def _resolve_command(name: str) -> BaseCommand:
+    """Return the ``plumbum`` command for ``name``, caching successful lookups.
+
+    A missing command raises ``CommandNotFound``, which ``functools.cache``
+    does not record, so installing a tool mid-run is still picked up.
+    """
+    from plumbum import local
+
+    return local[name]
+
+
 def get_command(name: str) -> BaseCommand:
     """Return a ``plumbum`` command, exiting with an error if it is missing."""
-    try:
-        return local[name]
-    except Exception as exc:  # pragma: no cover - error path
+    command = find_command(name)
+    if command is None:  # pragma: no cover - error path
         print(f"Required command not found: {name}", file=sys.stderr)
-        raise SystemExit(127) from exc
+        raise SystemExit(127)
+    return command
+
+
+def find_command(name: str) -> BaseCommand | None:
+    """Return the ``plumbum`` command for ``name``, or ``None`` if not on PATH.
+
+    Use this for optional tools where absence selects a fallback rather than
+    being an error. Found commands are resolved once per process.
+    """
+    from plumbum.commands.processes import CommandNotFound
+
+    try:
+        return _resolve_command(name)
+    except CommandNotFound:
+        return None
 
 
 def ensure_exists(path: Path, message: str) -> None:
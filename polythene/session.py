@@ -8,7 +8,8 @@ import shlex
 import typing as typ
 from pathlib import Path
 
-from .isolation import DEFAULT_STORE, ISOLATION_NAMES, IsolationName
+if typ.TYPE_CHECKING:
+    from .isolation import IsolationName
 
 __all__ = ["PolytheneSession"]
 
@@ -28,14 +29,23 @@ class SandboxRunner(typ.Protocol):
 def _normalize_store(store: Path | str | None) -> Path:
     """Return ``store`` as an absolute :class:`Path` with sensible defaults."""
     if store is None:
-        return DEFAULT_STORE
+        # Deferred so sessions with an explicit store never load the CLI module.
+        from .isolation import default_store
+
+        return default_store()
     path = Path(store)
     return path if path.is_absolute() else path.resolve()
 
 
+_TRUTHY_VALUES = frozenset({"1", "true", "yes", "on"})
+
+
 def _is_truthy(value: str | None) -> bool:
     """Return ``True`` when ``value`` represents an enabled flag."""
-    return False if value is None else value.lower() in {"1", "true", "yes", "on"}
+    if value is None:
+        return False
+    # Most callers pass an already-lowercase value; only fold case on a miss.
+    return value in _TRUTHY_VALUES or value.lower() in _TRUTHY_VALUES
 
 
 @dc.dataclass(slots=True)
@@ -48,7 +58,7 @@ class PolytheneSession:
         Object responsible for executing the generated argument vector.
     store:
         Root filesystem store directory. Defaults to
-        :data:`polythene.isolation.DEFAULT_STORE` when ``None``.
+        :func:`polythene.isolation.default_store` when ``None``.
     env:
         Environment mapping consulted for isolation defaults. When omitted the
         current :data:`os.environ` is used.
@@ -62,14 +72,19 @@ class PolytheneSession:
     store: Path | str | None = None
     env: typ.Mapping[str, str] | None = None
     uv_command: str = "uv"
-    _store_path: Path = dc.field(init=False)
-    _env: dict[str, str] = dc.field(init=False)
+    _store_arg: str = dc.field(init=False)
+    _explicit_isolation: str | None = dc.field(init=False)
+    _on_github_actions: bool = dc.field(init=False)
 
     def __post_init__(self) -> None:
         """Normalize configuration derived from constructor arguments."""
-        self._store_path = _normalize_store(self.store)
-        # Copy the environment once to avoid accidental mutation during calls.
-        self._env = dict(os.environ if self.env is None else self.env)
+        # The store is formatted once; every ``run`` reuses the same string.
+        self._store_arg = str(_normalize_store(self.store))
+        # Snapshot the environment flags once so later mutations of the
+        # mapping do not leak into calls, and ``run`` skips the lookups.
+        env = os.environ if self.env is None else self.env
+        self._explicit_isolation = env.get("POLYTHENE_ISOLATION") or None
+        self._on_github_actions = _is_truthy(env.get("GITHUB_ACTIONS"))
 
     def run(
         self,
@@ -125,28 +140,29 @@ class PolytheneSession:
             msg = "Command must contain at least one token"
             raise ValueError(msg)
 
-        argv = [
+        preferred_isolation = (
+            self._default_isolation() if isolation is None else isolation
+        )
+        isolation_args = (
+            [] if preferred_isolation is None else ["--isolation", preferred_isolation]
+        )
+        return [
             self.uv_command,
             "run",
             "polythene",
             "exec",
             uuid,
             "--store",
-            str(self._store_path),
+            self._store_arg,
+            *isolation_args,
+            "--",
+            *tokens,
         ]
 
-        preferred_isolation = isolation
-        if preferred_isolation is None:
-            preferred_isolation = self._default_isolation()
-        if preferred_isolation is not None:
-            argv.extend(["--isolation", preferred_isolation])
-
-        argv.append("--")
-        argv.extend(tokens)
-        return argv
-
     def _default_isolation(self) -> IsolationName | None:
-        if explicit := self._env.get("POLYTHENE_ISOLATION"):
+        # Validation stays here rather than in ``__post_init__`` so an invalid
+        # variable only fails sessions that rely on the environment default.
+        if explicit := self._explicit_isolation:
             match explicit:
                 case "bubblewrap":
                     return "bubblewrap"
@@ -155,10 +171,12 @@ class PolytheneSession:
                 case "chroot":
                     return "chroot"
                 case _:
+                    from .isolation import ISOLATION_NAMES
+
                     msg = (
                         "Invalid POLYTHENE_ISOLATION value."
                         " Supported values: " + ", ".join(ISOLATION_NAMES)
                     )
                     raise ValueError(msg)
 
-        return "proot" if _is_truthy(self._env.get("GITHUB_ACTIONS")) else None
+        return "proot" if self._on_github_actions else None
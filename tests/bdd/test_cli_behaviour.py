@@ -92,13 +92,17 @@ def stub_proot(monkeypatch: pytest.MonkeyPatch, cli_context: Context) -> None:
         assert binary == proot_backend.binary
         return stub
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_cmd(
+        cmd: tuple[str, ...], *, timeout: int | None, fg: bool = True
+    ) -> int:
         executions.append(cmd)
         return 0
 
-    monkeypatch.setattr(isolation, "BACKENDS", (proot_backend,))
+    monkeypatch.setattr(isolation, "get_backends", lambda: (proot_backend,))
+    monkeypatch.setattr(backend_module, "find_command", fake_get_command)
     monkeypatch.setattr(backend_module, "get_command", fake_get_command)
     monkeypatch.setattr(backend_module, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backend_module, "_run_probe", fake_run_cmd)
     cli_context["proot_stub"] = stub
     cli_context["proot_executions"] = executions
 
@@ -171,5 +175,4 @@ def assert_proot_non_login(cli_context: Context) -> None:
     assert len(stub.calls) == 2
     probe_call, exec_call = stub.calls
     assert probe_call[-2:] == ("-c", "true")
-    assert exec_call[-2] == "-c"
-    assert exec_call[-1] == "true"
+    assert exec_call[-2:] == ("-0", "true")
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import shlex
+import sys
 import typing as typ
 
 import pytest
@@ -13,16 +14,22 @@ from pytest_bdd import parsers, scenarios, then, when
 from polythene.cmd_utils import run_cmd
 
 if typ.TYPE_CHECKING:
-    import polythene.cmd_utils as cmd_utils_module
-else:  # pragma: no cover - runtime shim for annotations
-    cmd_utils_module = typ.cast("object", None)
+    from polythene.cmd_utils import Command
 
 Context = dict[str, object]
 
+# The interpreter running the suite, resolved once for the adapter steps.
+_PYTHON = local[sys.executable]
+
+_EXCEPTION_TYPES: dict[str, type[Exception]] = {
+    "TypeError": TypeError,
+    "ValueError": ValueError,
+}
+
 scenarios("../features/command_execution.feature")
 
 
-def _build_command(command: str) -> cmd_utils_module.Command:
+def _build_command(command: str) -> Command:
     """Construct a plumbum command from ``command`` or raise ``ValueError``."""
     parts = shlex.split(command)
     if not parts:
@@ -50,7 +57,6 @@ def run_command(
     except ValueError as exc:
         context["error"] = exc
         return
-    capsys.readouterr()
     try:
         result = run_cmd(cmd, fg=True)
     except (TypeError, TimeoutError) as exc:
@@ -78,8 +84,7 @@ def run_adapter(
     context: Context,
 ) -> None:
     """Execute a Python snippet via a plumbum adapter."""
-    cmd = local["python"]["-c", snippet]
-    capsys.readouterr()
+    cmd = _PYTHON["-c", snippet]
     result = run_cmd(cmd, fg=True)
     captured = capsys.readouterr()
     context["result"] = result
@@ -91,7 +96,7 @@ def run_adapter(
 @when("I execute run_cmd with an invalid command object")
 def run_invalid_command(context: Context) -> None:
     """Attempt to execute run_cmd with an invalid command value."""
-    invalid = typ.cast("cmd_utils_module.Command", object())
+    invalid = typ.cast("Command", object())
     with pytest.raises(TypeError) as exc_info:
         run_cmd(invalid)
     context["error"] = exc_info.value
@@ -108,8 +113,7 @@ def assert_stderr_contains(context: Context, text: str) -> None:
     """Check that the captured stderr output includes ``text``."""
     captured = context.get("captured")
     assert isinstance(captured, CaptureResult)
-    stderr = str(captured.err)
-    assert text in stderr
+    assert text in captured.err
 
 
 @then(parsers.parse('run_cmd raises a {exc_type} containing "{text}"'))
@@ -117,8 +121,7 @@ def assert_error_contains(context: Context, exc_type: str, text: str) -> None:
     """Check the stored error matches ``exc_type`` and message fragment."""
     error = context.get("error")
     assert error is not None, "Expected an error but none was recorded"
-    mapping = {"TypeError": TypeError, "ValueError": ValueError}
-    expected_type = mapping.get(exc_type)
+    expected_type = _EXCEPTION_TYPES.get(exc_type)
     assert expected_type is not None, f"Unknown exception type {exc_type!r}"
     assert isinstance(error, expected_type)
     assert text in str(error)
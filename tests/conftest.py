@@ -4,77 +4,73 @@ from __future__ import annotations
 
 import sys
 import typing as typ
-from contextlib import redirect_stderr, redirect_stdout
-from io import StringIO
 from runpy import run_module
 
 import pytest
 
 import polythene
+from polythene import backends, isolation, script_utils
 from tests.support.cli import CliResult
 
 __all__ = ["CliResult", "run_cli", "run_module_cli"]
 
 
+@pytest.fixture(autouse=True)
+def _reset_process_caches() -> typ.Iterator[None]:
+    """Drop process-lifetime caches so tests stay isolated from one another."""
+    yield
+    script_utils._resolve_command.cache_clear()
+    isolation.default_store.cache_clear()
+    isolation.container_tmp.cache_clear()
+    isolation.is_root.cache_clear()
+    isolation.get_backends.cache_clear()
+    backends._is_privileged_user.cache_clear()
+
+
+def _exit_code(exc: SystemExit) -> int:
+    """Return the integer exit status carried by ``exc``."""
+    code = exc.code
+    if code is None:
+        return 0
+    return code if isinstance(code, int) else int(code)
+
+
 @pytest.fixture
-def run_cli() -> typ.Callable[[typ.Sequence[str]], CliResult]:
+def run_cli(
+    capsys: pytest.CaptureFixture[str],
+) -> typ.Callable[[typ.Sequence[str]], CliResult]:
     """Return a helper that invokes the Cyclopts app and captures output."""
 
     def _invoke(args: typ.Sequence[str]) -> CliResult:
-        stdout_buffer = StringIO()
-        stderr_buffer = StringIO()
         exit_code = 0
-
+        capsys.readouterr()
         try:
-            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
-                polythene.app(list(args))
+            polythene.app(list(args))
         except SystemExit as exc:  # pragma: no cover - exercised in assertions
-            code = exc.code
-            if code is None:
-                exit_code = 0
-            elif isinstance(code, int):
-                exit_code = code
-            else:
-                exit_code = int(code)
-        return CliResult(
-            exit_code=exit_code,
-            stdout=stdout_buffer.getvalue(),
-            stderr=stderr_buffer.getvalue(),
-        )
+            exit_code = _exit_code(exc)
+        captured = capsys.readouterr()
+        return CliResult(exit_code=exit_code, stdout=captured.out, stderr=captured.err)
 
     return _invoke
 
 
 @pytest.fixture
-def run_module_cli() -> typ.Callable[[typ.Sequence[str]], CliResult]:
+def run_module_cli(
+    capfd: pytest.CaptureFixture[str],
+    monkeypatch: pytest.MonkeyPatch,
+) -> typ.Callable[[typ.Sequence[str]], CliResult]:
     """Return a helper that invokes ``python -m polythene``."""
 
     def _invoke(args: typ.Sequence[str]) -> CliResult:
-        stdout_buffer = StringIO()
-        stderr_buffer = StringIO()
         exit_code = 0
-        argv = ["python -m polythene", *args]
-        patcher = pytest.MonkeyPatch()
-        patcher.setattr(sys, "argv", list(argv), raising=False)
-
-        try:
-            with redirect_stdout(stdout_buffer), redirect_stderr(stderr_buffer):
+        capfd.readouterr()
+        with monkeypatch.context() as patcher:
+            patcher.setattr(sys, "argv", ["python -m polythene", *args])
+            try:
                 run_module("polythene", run_name="__main__")
-        except SystemExit as exc:  # pragma: no cover - exercised in assertions
-            code = exc.code
-            if code is None:
-                exit_code = 0
-            elif isinstance(code, int):
-                exit_code = code
-            else:
-                exit_code = int(code)
-        finally:
-            patcher.undo()
-
-        return CliResult(
-            exit_code=exit_code,
-            stdout=stdout_buffer.getvalue(),
-            stderr=stderr_buffer.getvalue(),
-        )
+            except SystemExit as exc:  # pragma: no cover - exercised in assertions
+                exit_code = _exit_code(exc)
+        captured = capfd.readouterr()
+        return CliResult(exit_code=exit_code, stdout=captured.out, stderr=captured.err)
 
     return _invoke
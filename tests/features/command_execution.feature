@@ -7,7 +7,7 @@ Feature: Running external commands
   Scenario: Executing a Python snippet via adapter
     When I execute run_cmd with adapter "print('ok')"
     Then run_cmd returns 0
-    And the stderr log includes "python -c"
+    And the stderr log includes "-c print('ok')"
 
   Scenario: Rejecting an empty command string
     When I execute run_cmd with no command in foreground
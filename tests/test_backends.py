@@ -4,9 +4,12 @@ from __future__ import annotations
 
 import errno
 import pathlib
+import threading
+import time
 import typing as typ
 
 import pytest
+from plumbum import local
 from plumbum.commands.processes import ProcessExecutionError
 
 from polythene import backends
@@ -49,26 +52,26 @@ def test_prepare_proot_avoids_login_shell(
     """``make_prepare_proot`` should not request a login shell.
 
     Login shells source profile scripts, which can mutate environment state in
-    unexpected ways.  The probe command already uses ``-c`` so the execution
-    command should mirror it to ensure a consistent environment.
+    unexpected ways. The probe uses a plain ``-c`` shell and the command itself
+    is executed directly, without any shell.
     """
     stub = _StubCommand()
     run_calls: list[tuple[str, ...]] = []
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(cmd: tuple[str, ...], *, timeout: int | None) -> int:
         run_calls.append(cmd)
         return 0
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
-    inner_cmd = "test -x /usr/bin/rust-toy-app"
+    inner_argv = ["test", "-x", "/usr/bin/rust-toy-app"]
     context = _make_context(container_tmp=tmp_path, logger=lambda _msg: None)
 
     prepare = backends.make_prepare_proot(context)
     result = prepare(
         typ.cast("BaseCommand", stub),
         tmp_path,
-        inner_cmd,
+        inner_argv,
     )
 
     assert stub.calls[0] == (
@@ -89,14 +92,7 @@ def test_prepare_proot_avoids_login_shell(
             "true",
         )
     ]
-    assert result == [
-        "-R",
-        str(tmp_path),
-        "-0",
-        "/bin/sh",
-        "-c",
-        inner_cmd,
-    ]
+    assert result == ["-R", str(tmp_path), "-0", *inner_argv]
 
 
 def test_make_prepare_bwrap_binds_context(
@@ -121,19 +117,18 @@ def test_make_prepare_bwrap_binds_context(
         lambda *_args, **_kwargs: proc_flags.copy(),
     )
 
-    def fake_run_cmd(
-        cmd: tuple[str, ...], *, fg: bool, timeout: int | None
+    def fake_run_probe(
+        cmd: tuple[str, ...], *, timeout: int | None
     ) -> int:  # pragma: no cover - instrumented below
-        assert fg is True
         probe_calls.append((cmd, timeout))
         return 0
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
     prepare = backends.make_prepare_bwrap(context)
     stub = _StubCommand()
 
-    result = prepare(typ.cast("BaseCommand", stub), tmp_path, "echo hi")
+    result = prepare(typ.cast("BaseCommand", stub), tmp_path, ["echo", "hi"])
 
     assert len(stub.calls) == 1
     probe_cmd, timeout = probe_calls[0]
@@ -142,13 +137,56 @@ def test_make_prepare_bwrap_binds_context(
     idx = probe_cmd.index("--tmpfs")
     assert probe_cmd[idx + 1] == str(context.container_tmp)
     assert result is not None
-    assert result[-2:] == ["-c", "echo hi"]
+    assert result[-3:] == ["/", "echo", "hi"]
+
+
+def test_prepare_bwrap_single_probe_when_supported(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Hosts accepting the full flag set need only one probe launch."""
+    monkeypatch.setattr(backends, "_is_privileged_user", lambda: True)
+    monkeypatch.setattr(backends, "_run_probe", lambda *_args, **_kwargs: 0)
+    stub = _StubCommand()
+
+    prepare = backends.make_prepare_bwrap(_make_context(container_tmp=tmp_path))
+    result = prepare(typ.cast("BaseCommand", stub), tmp_path, ["echo", "hi"])
+
+    assert len(stub.calls) == 1
+    assert stub.calls[0][:5] == ("--unshare-user", "--uid", "0", "--gid", "0")
+    assert "--proc" in stub.calls[0]
+    assert result is not None
+    assert stub.calls[0][-3:] == ("/bin/sh", "-c", "true")
+    assert result == [*stub.calls[0][:-3], "echo", "hi"]
+
+
+def test_prepare_bwrap_falls_back_to_stepwise_probes(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A failing combined probe retries without the unsupported flags."""
+    monkeypatch.setattr(backends, "_is_privileged_user", lambda: True)
+    stub = _StubCommand()
+
+    def fake_run_probe(cmd: tuple[str, ...], *, timeout: int | None) -> int:
+        if "--proc" in cmd:
+            raise ProcessExecutionError(cmd, 1, "", "mount proc: Operation denied")
+        return 0
+
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
+
+    prepare = backends.make_prepare_bwrap(_make_context(container_tmp=tmp_path))
+    result = prepare(typ.cast("BaseCommand", stub), tmp_path, ["echo", "hi"])
+
+    # combined, user namespace, /proc, and the final probe without /proc
+    assert len(stub.calls) == 4
+    assert result is not None
+    assert "--proc" not in result
+    assert result[:5] == ["--unshare-user", "--uid", "0", "--gid", "0"]
 
 
 def test_proot_backend_run_uses_non_login_shell(
     tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
-    """``Backend.run`` should propagate the non-login shell into execution."""
+    """``Backend.run`` executes the command directly, without a login shell."""
     backend = next(b for b in backends.create_backends() if b.name == "proot")
     stub = _StubCommand()
     executed: list[tuple[str, ...]] = []
@@ -157,18 +195,22 @@ def test_proot_backend_run_uses_non_login_shell(
         assert binary == backend.binary
         return stub
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_cmd(
+        cmd: tuple[str, ...], *, timeout: int | None, fg: bool = True
+    ) -> int:
         executed.append(cmd)
         return 0
 
+    monkeypatch.setattr(backends, "find_command", fake_get_command)
     monkeypatch.setattr(backends, "get_command", fake_get_command)
     monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_cmd)
 
     context = _make_context(container_tmp=tmp_path, logger=lambda _msg: None)
 
     outcome = backend.run(
         tmp_path,
-        "echo hi",
+        ["echo", "hi"],
         context=context,
     )
 
@@ -176,11 +218,26 @@ def test_proot_backend_run_uses_non_login_shell(
     assert len(stub.calls) == 2
     probe_call, exec_call = stub.calls
     assert probe_call[-2:] == ("-c", "true")
-    assert exec_call[-2] == "-c"
-    assert exec_call[-1] == "echo hi"
+    assert "-lc" not in exec_call
+    assert exec_call[-2:] == ("echo", "hi")
     assert executed == stub.calls
 
 
+def test_prepare_chroot_quotes_argv_for_path_reset(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The chroot backend keeps its PATH-resetting shell and quotes tokens."""
+    monkeypatch.setattr(backends, "_run_probe", lambda *_args, **_kwargs: 0)
+
+    prepare = backends.make_prepare_chroot(_make_context(container_tmp=tmp_path))
+    result = prepare(
+        typ.cast("BaseCommand", _StubCommand()), tmp_path, ["echo", "hello world"]
+    )
+
+    assert result is not None
+    assert result[-1].endswith("; echo 'hello world'")
+
+
 def test_probe_bwrap_userns_uses_context_timeout(
     tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
 ) -> None:
@@ -188,12 +245,12 @@ def test_probe_bwrap_userns_uses_context_timeout(
     stub = _StubCommand()
     timeouts: list[int | None] = []
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(cmd: tuple[str, ...], *, timeout: int | None) -> int:
         assert cmd[-1] == "true"
         timeouts.append(timeout)
         return 0
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
     monkeypatch.setattr(backends, "_is_privileged_user", lambda: True)
 
     context = _make_context(
@@ -214,10 +271,10 @@ def test_probe_bwrap_userns_permission_denied(
 ) -> None:
     """Permission denied during probing should disable bubblewrap early."""
 
-    def fake_run_cmd(_cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(_cmd: tuple[str, ...], *, timeout: int | None) -> int:
         raise ProcessExecutionError(_cmd, 1, "", "Permission denied")
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
     with pytest.raises(backends.BubblewrapUnavailable, match="unprivileged"):
         backends._probe_bwrap_userns(
@@ -231,10 +288,10 @@ def test_probe_bwrap_userns_oserror_eperm(
 ) -> None:
     """OS errors reporting ``EPERM`` disable bubblewrap immediately."""
 
-    def fake_run_cmd(_cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(_cmd: tuple[str, ...], *, timeout: int | None) -> int:
         raise OSError(errno.EPERM, "Operation not permitted")
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
     with pytest.raises(backends.BubblewrapUnavailable, match="unprivileged"):
         backends._probe_bwrap_userns(
@@ -252,14 +309,14 @@ def test_probe_bwrap_userns_respects_sysctl(
     monkeypatch.setattr(backends, "_UNPRIVILEGED_USERNS_PATH", flag)
     monkeypatch.setattr(backends, "_is_privileged_user", lambda: False)
 
-    def fail_run_cmd(*_args: object, **_kwargs: object) -> typ.NoReturn:
+    def fail_run_probe(*_args: object, **_kwargs: object) -> typ.NoReturn:
         # ty misreads pytest.fail's decorated signature; the call is correct.
         pytest.fail(
             "bubblewrap should not be probed when sysctl=0"  # ty: ignore[invalid-argument-type]
         )
         raise AssertionError("unreachable")  # appease Pyright's flow analysis
 
-    monkeypatch.setattr(backends, "run_cmd", fail_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fail_run_probe)
 
     with pytest.raises(backends.BubblewrapUnavailable, match="requires unprivileged"):
         backends._probe_bwrap_userns(
@@ -279,11 +336,11 @@ def test_probe_bwrap_userns_sysctl_missing(
     stub = _StubCommand()
     executed: list[tuple[str, ...]] = []
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(cmd: tuple[str, ...], *, timeout: int | None) -> int:
         executed.append(cmd)
         return 0
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
     result = backends._probe_bwrap_userns(
         typ.cast("BaseCommand", stub),
@@ -307,11 +364,11 @@ def test_probe_bwrap_userns_sysctl_read_error(
     executed: list[tuple[str, ...]] = []
     logs: list[str] = []
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(cmd: tuple[str, ...], *, timeout: int | None) -> int:
         executed.append(cmd)
         return 0
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
     result = backends._probe_bwrap_userns(
         typ.cast("BaseCommand", stub),
@@ -340,11 +397,11 @@ def test_probe_bwrap_userns_skips_sysctl_for_privileged(
     stub = _StubCommand()
     executed: list[tuple[str, ...]] = []
 
-    def fake_run_cmd(cmd: tuple[str, ...], *, fg: bool, timeout: int | None) -> int:
+    def fake_run_probe(cmd: tuple[str, ...], *, timeout: int | None) -> int:
         executed.append(cmd)
         return 0
 
-    monkeypatch.setattr(backends, "run_cmd", fake_run_cmd)
+    monkeypatch.setattr(backends, "_run_probe", fake_run_probe)
 
     result = backends._probe_bwrap_userns(
         typ.cast("BaseCommand", stub),
@@ -364,7 +421,7 @@ def test_backend_run_logs_bubblewrap_unavailability(
     def fake_prepare(
         _tool: object,
         _root: object,
-        _inner_cmd: object,
+        _inner_argv: object,
     ) -> list[str] | None:  # pragma: no cover - replaced in test
         message = "bubblewrap unavailable"
         raise backends.BubblewrapUnavailable(message)
@@ -375,19 +432,156 @@ def test_backend_run_logs_bubblewrap_unavailability(
         prepare_factory=lambda _context: fake_prepare,
     )
 
-    def fake_get_command(binary: str) -> _StubCommand:
+    def fake_find_command(binary: str) -> _StubCommand:
         assert binary == "bwrap"
         return _StubCommand()
 
-    monkeypatch.setattr(backends, "get_command", fake_get_command)
+    monkeypatch.setattr(backends, "find_command", fake_find_command)
 
     context = _make_context(container_tmp=tmp_path, logger=messages.append)
 
     outcome = backend.run(
         tmp_path,
-        "echo hi",
+        ["echo", "hi"],
         context=context,
     )
 
     assert outcome is None
     assert messages == ["bubblewrap unavailable"]
+
+
+def test_ensure_runtime_paths_creates_missing_directories(
+    tmp_path: pathlib.Path,
+) -> None:
+    """Only the runtime directories absent from the rootfs are created."""
+    (tmp_path / "dev").mkdir()
+    (tmp_path / "dev" / "marker").touch()
+
+    backends.ensure_runtime_paths(tmp_path)
+
+    assert (tmp_path / "dev" / "marker").exists()
+    assert (tmp_path / "tmp").is_dir()
+
+
+def test_ensure_runtime_paths_creates_missing_root(tmp_path: pathlib.Path) -> None:
+    """A missing rootfs directory is created along with its runtime paths."""
+    root = tmp_path / "rootfs"
+
+    backends.ensure_runtime_paths(root)
+
+    assert (root / "dev").is_dir()
+    assert (root / "tmp").is_dir()
+
+
+def test_ensure_runtime_paths_relists_without_a_listing(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Without a ``scan_rootfs`` listing, each call inspects the root afresh."""
+    listed: list[pathlib.Path] = []
+    original = backends.scan_rootfs
+
+    def _recording(root: pathlib.Path) -> frozenset[str] | None:
+        listed.append(root)
+        return original(root)
+
+    monkeypatch.setattr(backends, "scan_rootfs", _recording)
+
+    backends.ensure_runtime_paths(tmp_path)
+    backends.ensure_runtime_paths(tmp_path)
+
+    assert listed == [tmp_path, tmp_path]
+
+
+def test_scan_rootfs_primes_runtime_path_check(
+    tmp_path: pathlib.Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """The existence check's listing is reused, unmodified, for the root."""
+    (tmp_path / "dev").mkdir()
+
+    present = backends.scan_rootfs(tmp_path)
+    assert present == {"dev"}
+    monkeypatch.setattr(backends, "scan_rootfs", lambda _root: pytest.fail("relisted"))
+    backends.ensure_runtime_paths(tmp_path, present)
+
+    assert (tmp_path / "tmp").is_dir()
+    assert present == {"dev"}
+
+
+def test_scan_rootfs_rejects_missing_or_file_roots(tmp_path: pathlib.Path) -> None:
+    """Missing paths and regular files are not usable roots."""
+    file_root = tmp_path / "file"
+    file_root.touch()
+
+    assert backends.scan_rootfs(tmp_path / "missing") is None
+    assert backends.scan_rootfs(file_root) is None
+
+
+def test_is_privileged_user_is_cached(monkeypatch: pytest.MonkeyPatch) -> None:
+    """The effective UID is queried once per process."""
+    calls: list[None] = []
+
+    def _geteuid() -> int:
+        calls.append(None)
+        return 0
+
+    monkeypatch.setattr(backends.os, "geteuid", _geteuid)
+    backends._is_privileged_user.cache_clear()
+
+    assert backends._is_privileged_user() is True
+    assert backends._is_privileged_user() is True
+    assert len(calls) == 1
+
+
+def test_run_probe_succeeds_quietly(capfd: pytest.CaptureFixture[str]) -> None:
+    """Successful probes echo the command but discard its output."""
+    backends._run_probe(local["echo"]["probe-output"], timeout=None)
+
+    captured = capfd.readouterr()
+    assert captured.out == ""
+    assert captured.err.startswith("$ ")
+
+
+def test_run_probe_captures_permission_errors() -> None:
+    """Failed probes carry stderr so permission errors are recognised."""
+    failing = local["sh"]["-c", "echo 'Permission denied' >&2; exit 1"]
+
+    with pytest.raises(ProcessExecutionError) as excinfo:
+        backends._run_probe(failing, timeout=None)
+
+    assert excinfo.value.retcode == 1
+    assert backends._is_bwrap_perm_error(excinfo.value)
+
+
+def test_run_probe_honours_timeout() -> None:
+    """Probes exceeding the timeout are killed and raise ``TimeoutError``."""
+    with pytest.raises(TimeoutError):
+        backends._run_probe(local["sleep"]["5"], timeout=0)
+
+
+def test_probe_group_cancel_kills_running_probes() -> None:
+    """Cancelling a probe group kills its probes and refuses new ones."""
+    group = backends.ProbeGroup()
+    errors: list[BaseException] = []
+
+    def _probe() -> None:
+        token = backends._ACTIVE_PROBES.set(group)
+        try:
+            backends._run_probe(local["sleep"]["30"], timeout=None)
+        except ProcessExecutionError as exc:
+            errors.append(exc)
+        finally:
+            backends._ACTIVE_PROBES.reset(token)
+
+    worker = threading.Thread(target=_probe)
+    worker.start()
+    deadline = time.monotonic() + 5
+    while not group._running and time.monotonic() < deadline:
+        time.sleep(0.01)
+    group.cancel()
+    worker.join(timeout=5)
+
+    assert not worker.is_alive()
+    assert len(errors) == 1
+    _probe()
+    assert len(errors) == 2
+    assert "cancelled" in str(errors[1])
@@ -5,12 +5,17 @@ from __future__ import annotations
 import typing as typ
 
 import pytest
-from plumbum import local
+from plumbum import FG, local
 from plumbum.commands.processes import (
     ProcessTimedOut,
 )
 
-from polythene.cmd_utils import TimeoutConflictError, _merge_timeout, run_cmd
+from polythene.cmd_utils import (
+    TimeoutConflictError,
+    _capabilities,
+    _merge_timeout,
+    run_cmd,
+)
 
 
 def test_run_cmd_command_logs_and_succeeds(
@@ -26,13 +31,24 @@ def test_run_cmd_command_logs_and_succeeds(
 
 
 def test_run_cmd_adapter_handles_output(capsys: pytest.CaptureFixture[str]) -> None:
-    """Adapters run successfully and log their invocation."""
-    cmd = local["python"]["-c", "print('unit')"]
-    capsys.readouterr()
-    result = run_cmd(cmd, fg=True)
-    captured = capsys.readouterr()
+    """Adapters exposing ``run_fg`` run in the foreground and log their call."""
+    received: list[dict[str, object]] = []
+
+    class _Adapter:
+        def formulate(self) -> list[str]:
+            return ["python", "-c", "print('unit')"]
+
+        def run_fg(self, **kwargs: object) -> None:
+            received.append(kwargs)
+
+        def __call__(self, *args: object, **kwargs: object) -> int:
+            return 0
+
+    result = run_cmd(_Adapter(), fg=True)
+
     assert result == 0
-    assert "python -c" in captured.err
+    assert received == [{}]
+    assert "python -c" in capsys.readouterr().err
 
 
 def test_run_cmd_rejects_string_commands() -> None:
@@ -112,3 +128,50 @@ def test_run_cmd_timeout_raises_timeout_error_on_expiry() -> None:
 
     with pytest.raises(TimeoutError):
         run_cmd(cmd, fg=True, timeout=1)
+
+
+def test_capabilities_are_cached_per_type() -> None:
+    """Capability detection runs once per command type."""
+    first = _capabilities(local["echo"]["a"])
+    second = _capabilities(local["echo"]["b"])
+
+    assert first is second
+    assert first.formulate
+    assert first.run
+    assert not _capabilities("echo").formulate
+
+
+def test_run_cmd_echoes_formulated_tokens(
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    """The echo line joins the tokens reported by ``formulate``."""
+
+    class _Formulated:
+        def formulate(self) -> list[str]:
+            return ["tool", "--flag", "'quoted arg'"]
+
+        def __call__(self, *args: object, **kwargs: object) -> int:
+            return 0
+
+    run_cmd(_Formulated())
+
+    assert capsys.readouterr().err == "$ tool --flag 'quoted arg'\n"
+
+
+def test_run_cmd_foreground_and_uses_plumbum_fg() -> None:
+    """Commands without ``run_fg`` are executed via ``cmd & FG``."""
+    received: list[object] = []
+
+    class _AndOnly:
+        def formulate(self) -> list[str]:
+            return ["and-only"]
+
+        def __and__(self, other: object) -> int:
+            received.append(other)
+            return 0
+
+        def __call__(self, *args: object, **kwargs: object) -> int:
+            return 0
+
+    assert run_cmd(_AndOnly(), fg=True) == 0
+    assert received == [FG]
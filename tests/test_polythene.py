@@ -2,18 +2,29 @@
 
 from __future__ import annotations
 
+import fcntl
 import importlib
+import io
+import os
+import re
+import stat
+import sys
+import tarfile
+import threading
+import time
 import typing as typ
+import uuid
+from pathlib import Path
 
 import pytest
+from plumbum import local
+from plumbum.commands.processes import ProcessExecutionError
 
 import polythene
 import polythene.isolation as isolation
 from polythene import backends
 
 if typ.TYPE_CHECKING:
-    from pathlib import Path
-
     from tests.support.cli import CliResult
 
 
@@ -84,6 +95,49 @@ def test_cmd_pull_retries_existing_uuid(
     assert call_count == 2
 
 
+def test_cmd_run_executes_in_throwaway_rootfs(
+    run_cli: typ.Callable[[typ.Sequence[str]], CliResult],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """``run`` exports, executes, and removes the rootfs in one invocation."""
+    exported: list[Path] = []
+
+    def _fake_export(image: str, dest: Path, *, timeout: int | None = None) -> None:
+        exported.append(dest)
+        dest.mkdir(parents=True)
+
+    backend = _DummyBackend(3)
+    monkeypatch.setattr(isolation, "export_rootfs", _fake_export)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (backend,))
+
+    result = run_cli(
+        ["run", "busybox", "--store", tmp_path.as_posix(), "--", "echo", "hi"]
+    )
+
+    assert result.exit_code == 3
+    assert len(exported) == 1
+    assert exported[0].parent.parent == tmp_path
+    assert backend.calls == [(exported[0], ("echo", "hi"), None)]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_cmd_run_requires_command(
+    run_cli: typ.Callable[[typ.Sequence[str]], CliResult],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """``run`` rejects a missing command before exporting anything."""
+    monkeypatch.setattr(
+        isolation, "export_rootfs", lambda *_a, **_k: pytest.fail("exported")
+    )
+
+    result = run_cli(["run", "busybox", "--store", tmp_path.as_posix()])
+
+    assert result.exit_code == 2
+    assert "No command provided" in result.stderr
+
+
 class _DummyBackend:
     def __init__(
         self,
@@ -95,17 +149,26 @@ class _DummyBackend:
         self.exit_code = exit_code
         self.requires_root = requires_root
         self.name = name
-        self.calls: list[tuple[Path, str, int | None]] = []
+        # ``calls`` records preparation (probing); ``executed`` records runs.
+        self.calls: list[tuple[Path, tuple[str, ...], int | None]] = []
+        self.executed: list[tuple[str, ...]] = []
 
-    def run(
+    def prepare(
         self,
         root: Path,
-        inner_cmd: str,
+        inner_argv: typ.Sequence[str],
         *,
         context: backends.BackendContext,
-    ) -> tuple[str, int] | None:
-        self.calls.append((root, inner_cmd, context.timeout))
-        return None if self.exit_code is None else (self.name, self.exit_code)
+    ) -> list[str] | None:
+        self.calls.append((root, tuple(inner_argv), context.timeout))
+        return None if self.exit_code is None else list(inner_argv)
+
+    def execute(
+        self, args: typ.Sequence[str], *, context: backends.BackendContext
+    ) -> int:
+        assert self.exit_code is not None
+        self.executed.append(tuple(args))
+        return self.exit_code
 
 
 def test_normalize_command_args_flattens_single_sequence() -> None:
@@ -132,14 +195,14 @@ def test_cmd_exec_accepts_list_command(
     root.mkdir(parents=True)
 
     backend = _DummyBackend(0)
-    monkeypatch.setattr(isolation, "BACKENDS", (backend,))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (backend,))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
 
     isolation.cmd_exec(
         "uuid-list", typ.cast("str", ["echo", "hello world"]), store=tmp_path
     )
 
-    assert backend.calls == [(root, "echo 'hello world'", None)]
+    assert backend.calls == [(root, ("echo", "hello world"), None)]
 
 
 def test_cmd_exec_accepts_varargs_command(
@@ -151,12 +214,12 @@ def test_cmd_exec_accepts_varargs_command(
     root.mkdir(parents=True)
 
     backend = _DummyBackend(0)
-    monkeypatch.setattr(isolation, "BACKENDS", (backend,))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (backend,))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
 
     isolation.cmd_exec("uuid-varargs", "echo", "hello", store=tmp_path)
 
-    assert backend.calls == [(root, "echo hello", None)]
+    assert backend.calls == [(root, ("echo", "hello"), None)]
 
 
 def test_cmd_exec_uses_first_available_backend(
@@ -170,8 +233,8 @@ def test_cmd_exec_uses_first_available_backend(
 
     primary = _DummyBackend(0)
     fallback = _DummyBackend(None)
-    monkeypatch.setattr(isolation, "BACKENDS", (primary, fallback))
-    monkeypatch.setattr(isolation, "IS_ROOT", False)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (primary, fallback))
+    monkeypatch.setattr(isolation, "is_root", lambda: False)
 
     result = run_cli(
         [
@@ -188,8 +251,9 @@ def test_cmd_exec_uses_first_available_backend(
     )
 
     assert result.exit_code == 0
-    assert primary.calls == [(root, "echo 'hello world'", 15)]
-    assert fallback.calls == []
+    assert primary.calls == [(root, ("echo", "hello world"), 15)]
+    assert primary.executed == [("echo", "hello world")]
+    assert fallback.executed == []
 
 
 def test_cmd_exec_logs_bubblewrap_fallback(
@@ -203,8 +267,8 @@ def test_cmd_exec_logs_bubblewrap_fallback(
 
     bubblewrap = _DummyBackend(None, name="bubblewrap")
     proot = _DummyBackend(0, name="proot")
-    monkeypatch.setattr(isolation, "BACKENDS", (bubblewrap, proot))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (bubblewrap, proot))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
     monkeypatch.setattr(isolation, "VERBOSE", True)
 
     result = run_cli(
@@ -222,8 +286,8 @@ def test_cmd_exec_logs_bubblewrap_fallback(
 
     assert result.exit_code == 0
     assert "bubblewrap unavailable: falling back to proot" in result.stderr
-    assert bubblewrap.calls == [(root, "true", None)]
-    assert proot.calls == [(root, "true", None)]
+    assert bubblewrap.calls == [(root, ("true",), None)]
+    assert proot.calls == [(root, ("true",), None)]
 
 
 def test_cmd_exec_allows_leading_hyphen_arguments(
@@ -236,8 +300,8 @@ def test_cmd_exec_allows_leading_hyphen_arguments(
     root.mkdir(parents=True)
 
     backend = _DummyBackend(0)
-    monkeypatch.setattr(isolation, "BACKENDS", (backend,))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (backend,))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
 
     result = run_cli(
         [
@@ -246,13 +310,41 @@ def test_cmd_exec_allows_leading_hyphen_arguments(
             "--store",
             tmp_path.as_posix(),
             "--",
+            "ls",
             "-l",
             "--colour",
         ]
     )
 
     assert result.exit_code == 0
-    assert backend.calls == [(root, "-l --colour", None)]
+    assert backend.calls == [(root, ("ls", "-l", "--colour"), None)]
+
+
+@pytest.mark.parametrize("command", ["exec", "run"])
+def test_cli_rejects_option_as_program(
+    run_cli: typ.Callable[[typ.Sequence[str]], CliResult],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+    command: str,
+) -> None:
+    """A leading ``-`` token would be read as a sandbox option, so it is refused."""
+    (tmp_path / "uuid-option").mkdir()
+    backend = _DummyBackend(0)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (backend,))
+    monkeypatch.setattr(
+        isolation,
+        "export_rootfs",
+        lambda *_args, **_kwargs: pytest.fail("exported before validation"),
+    )
+    target = "uuid-option" if command == "exec" else "busybox"
+
+    result = run_cli(
+        [command, target, "--store", tmp_path.as_posix(), "--", "-l", "--colour"]
+    )
+
+    assert result.exit_code == 2
+    assert "Command must start with a program, not an option: -l" in result.stderr
+    assert backend.calls == []
 
 
 def test_cmd_exec_reports_missing_root(
@@ -286,8 +378,8 @@ def test_cmd_exec_propagates_backend_error(
 
     unavailable = _DummyBackend(None)
     failing = _DummyBackend(42)
-    monkeypatch.setattr(isolation, "BACKENDS", (unavailable, failing))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (unavailable, failing))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
 
     result = run_cli(
         [
@@ -326,12 +418,91 @@ def test_cmd_exec_requires_command(
     assert "No command provided" in result.stderr
 
 
+def test_cmd_exec_probes_backends_concurrently(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Fallback probes run alongside the preferred backend's probe."""
+    root = tmp_path / "uuid-parallel"
+    root.mkdir()
+    barrier = threading.Barrier(2, timeout=5)
+
+    class _RendezvousBackend(_DummyBackend):
+        def prepare(
+            self,
+            root: Path,
+            inner_argv: typ.Sequence[str],
+            *,
+            context: backends.BackendContext,
+        ) -> list[str] | None:
+            barrier.wait()  # breaks if the probes were serialised
+            return super().prepare(root, inner_argv, context=context)
+
+    bubblewrap = _RendezvousBackend(None, name="bubblewrap")
+    proot = _RendezvousBackend(0, name="proot")
+    monkeypatch.setattr(isolation, "get_backends", lambda: (bubblewrap, proot))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
+
+    isolation.cmd_exec("uuid-parallel", "true", store=tmp_path)
+
+    assert bubblewrap.executed == []
+    assert proot.executed == [("true",)]
+
+
+def test_cmd_exec_does_not_wait_for_lower_priority_probes(tmp_path: Path) -> None:
+    """The CLI exits once the winner finishes, killing slower probes."""
+    (tmp_path / "uuid-abandon").mkdir()
+    fakebin = tmp_path / "bin"
+    fakebin.mkdir()
+    scripts = {
+        "proot": "#!/bin/sh\nexit 0\n",
+        # ``exec`` so killing the probe reaches the sleep holding its pipes.
+        "bwrap": "#!/bin/sh\nexec sleep 60\n",
+        "chroot": "#!/bin/sh\nexec sleep 60\n",
+    }
+    for name, body in scripts.items():
+        script = fakebin / name
+        script.write_text(body)
+        script.chmod(0o755)
+    argv = (
+        "-m",
+        "polythene",
+        "exec",
+        "uuid-abandon",
+        "--store",
+        tmp_path.as_posix(),
+        "--isolation",
+        "proot",
+        "--",
+        "true",
+    )
+
+    start = time.monotonic()
+    with local.env(PATH=f"{fakebin}:/usr/bin:/bin"):
+        proc = local[sys.executable][argv].popen()
+    _stdout, stderr = proc.communicate(timeout=30)
+    elapsed = time.monotonic() - start
+
+    assert proc.returncode == 0, stderr
+    assert elapsed < 20
+
+
+@pytest.mark.parametrize(
+    ("isolation_args", "env_preference"),
+    [
+        (["--isolation=proot"], None),
+        (["--isolation", "proot"], None),
+        ([], "proot"),
+    ],
+    ids=["flag-equals", "flag", "environment"],
+)
 def test_cmd_exec_prefers_requested_isolation(
     run_cli: typ.Callable[[typ.Sequence[str]], CliResult],
     monkeypatch: pytest.MonkeyPatch,
     tmp_path: Path,
+    isolation_args: list[str],
+    env_preference: str | None,
 ) -> None:
-    """``--isolation`` reorders backend probing to honour the preference."""
+    """``--isolation`` or ``POLYTHENE_ISOLATION`` reorders backend probing."""
     root = tmp_path / "uuid-preferred"
     root.mkdir()
 
@@ -339,8 +510,10 @@ def test_cmd_exec_prefers_requested_isolation(
     proot = _DummyBackend(0, name="proot")
     chroot = _DummyBackend(0, name="chroot")
 
-    monkeypatch.setattr(isolation, "BACKENDS", (bubblewrap, proot, chroot))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (bubblewrap, proot, chroot))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
+    if env_preference is not None:
+        monkeypatch.setenv("POLYTHENE_ISOLATION", env_preference)
 
     result = run_cli(
         [
@@ -348,15 +521,16 @@ def test_cmd_exec_prefers_requested_isolation(
             "uuid-preferred",
             "--store",
             tmp_path.as_posix(),
-            "--isolation=proot",
+            *isolation_args,
             "--",
             "true",
         ]
     )
 
     assert result.exit_code == 0
-    assert proot.calls == [(root, "true", None)]
-    assert bubblewrap.calls == []
+    assert proot.calls == [(root, ("true",), None)]
+    assert proot.executed == [("true",)]
+    assert bubblewrap.executed == []
 
 
 def test_cmd_exec_falls_back_when_preferred_unavailable(
@@ -372,8 +546,8 @@ def test_cmd_exec_falls_back_when_preferred_unavailable(
     proot = _DummyBackend(None, name="proot")
     chroot = _DummyBackend(0, name="chroot")
 
-    monkeypatch.setattr(isolation, "BACKENDS", (bubblewrap, proot, chroot))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
+    monkeypatch.setattr(isolation, "get_backends", lambda: (bubblewrap, proot, chroot))
+    monkeypatch.setattr(isolation, "is_root", lambda: True)
 
     result = run_cli(
         [
@@ -389,39 +563,8 @@ def test_cmd_exec_falls_back_when_preferred_unavailable(
     )
 
     assert result.exit_code == 0
-    assert proot.calls == [(root, "true", None)]
-    assert bubblewrap.calls == [(root, "true", None)]
-
-
-def test_cmd_exec_reads_isolation_from_environment(
-    run_cli: typ.Callable[[typ.Sequence[str]], CliResult],
-    monkeypatch: pytest.MonkeyPatch,
-    tmp_path: Path,
-) -> None:
-    """The CLI honours ``POLYTHENE_ISOLATION`` when no flag is provided."""
-    root = tmp_path / "uuid-env"
-    root.mkdir()
-
-    bubblewrap = _DummyBackend(0, name="bubblewrap")
-    proot = _DummyBackend(0, name="proot")
-    monkeypatch.setattr(isolation, "BACKENDS", (bubblewrap, proot))
-    monkeypatch.setattr(isolation, "IS_ROOT", True)
-    monkeypatch.setenv("POLYTHENE_ISOLATION", "proot")
-
-    result = run_cli(
-        [
-            "exec",
-            "uuid-env",
-            "--store",
-            tmp_path.as_posix(),
-            "--",
-            "true",
-        ]
-    )
-
-    assert result.exit_code == 0
-    assert proot.calls == [(root, "true", None)]
-    assert bubblewrap.calls == []
+    assert proot.calls == [(root, ("true",), None)]
+    assert bubblewrap.calls == [(root, ("true",), None)]
 
 
 def test_cmd_exec_rejects_unknown_isolation(
@@ -523,3 +666,355 @@ def test_main_accepts_custom_arguments(monkeypatch: pytest.MonkeyPatch) -> None:
     polythene.main(["pull", "busybox"])
 
     assert received == ["pull", "busybox"]
+
+
+def test_package_import_defers_cli_dependencies() -> None:
+    """``import polythene`` does not load the CLI stack until it is needed."""
+    probe = (
+        "import sys, polythene; "
+        "print(sorted(m for m in ('cyclopts', 'plumbum') if m in sys.modules))"
+    )
+
+    output = local[sys.executable]["-c", probe]()
+
+    assert output.strip() == "[]"
+
+
+def test_package_exports_resolve_lazily() -> None:
+    """Lazy exports resolve to the objects defined in their submodules."""
+    assert polythene.cmd_exec is isolation.cmd_exec
+    assert "PolytheneSession" in dir(polythene)
+    with pytest.raises(AttributeError, match="no attribute 'missing'"):
+        _ = polythene.missing  # type: ignore[attr-defined]
+
+
+def test_isolation_import_defers_process_dependencies() -> None:
+    """Importing the CLI module leaves Plumbum unloaded."""
+    probe = (
+        "import sys, polythene.isolation; "
+        "print(sorted(m for m in ('plumbum',) if m in sys.modules))"
+    )
+
+    output = local[sys.executable]["-c", probe]()
+
+    assert output.strip() == "[]"
+
+
+def test_store_path_for_normalises_without_resolving(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Store paths are made absolute lexically, leaving symlinks in place."""
+    real = tmp_path / "real"
+    real.mkdir()
+    link = tmp_path / "link"
+    link.symlink_to(real)
+    monkeypatch.chdir(tmp_path)
+
+    assert isolation.store_path_for("uuid-1", link) == link / "uuid-1"
+    assert isolation.store_path_for("uuid-1", Path("link/./sub/..")) == (
+        link / "uuid-1"
+    )
+
+
+def test_log_writes_timestamped_line_when_verbose(
+    monkeypatch: pytest.MonkeyPatch, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Verbose logs carry an ``[HH:MM:SS]`` prefix; quiet mode prints nothing."""
+    monkeypatch.setattr(isolation, "VERBOSE", False)
+    isolation.log("hidden")
+    assert capsys.readouterr().err == ""
+
+    monkeypatch.setattr(isolation, "VERBOSE", True)
+    isolation.log("shown")
+    err = capsys.readouterr().err
+
+    assert re.fullmatch(r"\[\d{2}:\d{2}:\d{2}\] shown\n", err)
+
+
+def test_generate_uuid_is_rfc_9562_v7() -> None:
+    """Generated identifiers are valid, time-ordered UUIDv7 strings."""
+    before_ms = time.time_ns() // 1_000_000
+    first = uuid.UUID(isolation.generate_uuid())
+    second = uuid.UUID(isolation.generate_uuid())
+    after_ms = time.time_ns() // 1_000_000
+
+    assert first.version == 7
+    assert first.variant == uuid.RFC_4122
+    assert before_ms <= first.int >> 80 <= after_ms
+    assert str(first) != str(second)
+
+
+def test_isolation_names_match_literal() -> None:
+    """The runtime tuple mirrors the ``IsolationName`` literal."""
+    assert typ.get_args(isolation.IsolationName) == isolation.ISOLATION_NAMES
+
+
+def test_get_backends_is_cached() -> None:
+    """The backend registry is created once and shared by ``BACKENDS``."""
+    assert isolation.get_backends() is isolation.get_backends()
+    assert isolation.BACKENDS is isolation.get_backends()
+
+
+def test_configuration_constants_resolve_through_accessors() -> None:
+    """The former module constants delegate to their cached accessors."""
+    assert isolation.DEFAULT_STORE is isolation.default_store()
+    assert isolation.CONTAINER_TMP is isolation.container_tmp()
+    assert isolation.IS_ROOT is isolation.is_root()
+
+
+def test_podman_env_preserves_caller_settings(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Podman tuning defaults never override values set by the caller."""
+    monkeypatch.setenv("CONTAINERS_STORAGE_DRIVER", "overlay")
+    monkeypatch.delenv("CONTAINERS_EVENTS_BACKEND", raising=False)
+
+    assert isolation._podman_env() == {"CONTAINERS_EVENTS_BACKEND": "file"}
+
+
+def test_cmd_exec_defaults_store_from_environment(
+    run_cli: typ.Callable[[typ.Sequence[str]], CliResult],
+    monkeypatch: pytest.MonkeyPatch,
+    tmp_path: Path,
+) -> None:
+    """Without ``--store`` the CLI falls back to ``POLYTHENE_STORE``."""
+    monkeypatch.setenv("POLYTHENE_STORE", tmp_path.as_posix())
+
+    result = run_cli(["exec", "missing", "--", "true"])
+
+    assert result.exit_code == 1
+    assert f"({tmp_path / 'missing'})" in result.stderr
+
+
+def test_cmd_exec_programmatic_store_follows_environment(
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+    tmp_path: Path,
+) -> None:
+    """Direct callers resolve ``POLYTHENE_STORE`` via ``default_store``."""
+    monkeypatch.setenv("POLYTHENE_STORE", tmp_path.as_posix())
+
+    with pytest.raises(SystemExit) as excinfo:
+        isolation.cmd_exec("missing", "true")
+
+    assert excinfo.value.code == 1
+    assert f"({tmp_path / 'missing'})" in capsys.readouterr().err
+
+
+def _write_archive(path: Path, members: typ.Iterable[tarfile.TarInfo]) -> Path:
+    """Write ``members`` (as empty files, directories, or links) to ``path``."""
+    with tarfile.open(path, "w") as archive:
+        for member in members:
+            payload = io.BytesIO(b"x" * member.size) if member.isfile() else None
+            archive.addfile(member, payload)
+    return path
+
+
+def _member(
+    name: str, kind: bytes = tarfile.REGTYPE, **attrs: object
+) -> tarfile.TarInfo:
+    """Return a ``TarInfo`` named ``name`` of type ``kind``."""
+    info = tarfile.TarInfo(name)
+    info.type = kind
+    for key, value in attrs.items():
+        setattr(info, key, value)
+    return info
+
+
+def test_stream_export_extracts_preserving_modes(tmp_path: Path) -> None:
+    """Streamed exports keep sticky and setuid bits needed by a rootfs."""
+    archive = _write_archive(
+        tmp_path / "rootfs.tar",
+        [
+            _member("tmp", tarfile.DIRTYPE, mode=0o1777),
+            _member("bin", tarfile.DIRTYPE, mode=0o755),
+            _member("bin/su", mode=0o4755, size=1),
+            _member("bin/sh", tarfile.SYMTYPE, linkname="/bin/su"),
+        ],
+    )
+    dest = tmp_path / "dest"
+    dest.mkdir()
+
+    isolation._stream_export(local["cat"][archive], dest)
+
+    assert stat.S_IMODE((dest / "tmp").stat().st_mode) == 0o1777
+    assert stat.S_IMODE((dest / "bin" / "su").stat().st_mode) == 0o4755
+    assert (dest / "bin" / "sh").readlink() == Path("/bin/su")
+
+
+def test_stream_export_reports_exporter_failure(tmp_path: Path) -> None:
+    """A failing export command surfaces as ``ProcessExecutionError``."""
+    with pytest.raises(ProcessExecutionError):
+        isolation._stream_export(local["false"], tmp_path)
+
+
+@pytest.mark.parametrize(
+    "exporter",
+    [["yes"], ["head", "-c", "20000000", "/dev/urandom"]],
+    ids=["yes", "urandom"],
+)
+def test_stream_export_rejects_corrupt_stream_without_hanging(
+    tmp_path: Path, exporter: list[str]
+) -> None:
+    """A non-tar exporter that keeps writing is cut off, not waited on."""
+    with pytest.raises(tarfile.ReadError):
+        isolation._stream_export(local[exporter[0]][exporter[1:]], tmp_path)
+
+
+def test_stream_export_honours_timeout(tmp_path: Path) -> None:
+    """Exports exceeding the timeout are killed and raise ``TimeoutError``."""
+    with pytest.raises(TimeoutError):
+        isolation._stream_export(local["sleep"]["5"], tmp_path, timeout=0)
+
+
+@pytest.mark.skipif(
+    not hasattr(fcntl, "F_GETPIPE_SZ"), reason="pipe sizing is Linux-only"
+)
+def test_widen_pipe_grows_kernel_buffer() -> None:
+    """The export pipe is widened so the exporter can run ahead."""
+    read_fd, write_fd = os.pipe()
+    with os.fdopen(read_fd, "rb") as reader, os.fdopen(write_fd, "wb"):
+        isolation._widen_pipe(reader)
+        size = fcntl.fcntl(reader.fileno(), fcntl.F_GETPIPE_SZ)
+
+    assert size >= isolation._EXPORT_BUFSIZE
+
+
+def test_rootfs_member_filter_rejects_escaping_paths(tmp_path: Path) -> None:
+    """Members resolving outside the destination are refused."""
+    with pytest.raises(tarfile.OutsideDestinationError):
+        isolation._rootfs_member_filter(
+            _member("../escape"), tmp_path.as_posix(), root=tmp_path
+        )
+    with pytest.raises(tarfile.LinkOutsideDestinationError):
+        isolation._rootfs_member_filter(
+            _member("link", tarfile.LNKTYPE, linkname="../../etc/passwd"),
+            tmp_path.as_posix(),
+            root=tmp_path,
+        )
+
+
+def test_rootfs_member_filter_strips_leading_slash(tmp_path: Path) -> None:
+    """Absolute member names are extracted relative to the destination."""
+    admitted = isolation._rootfs_member_filter(
+        _member("/etc/hostname"), tmp_path.as_posix(), root=tmp_path
+    )
+
+    assert admitted is not None
+    assert admitted.name == "etc/hostname"
+
+
+def test_rootfs_member_filter_skips_devices_when_unprivileged(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Device nodes are dropped when the caller cannot create them."""
+    monkeypatch.setattr(isolation, "is_root", lambda: False)
+
+    admitted = isolation._rootfs_member_filter(
+        _member("dev/null", tarfile.CHRTYPE), tmp_path.as_posix(), root=tmp_path
+    )
+
+    assert admitted is None
+
+
+def test_write_metadata_records_image(tmp_path: Path) -> None:
+    """Export metadata names the image and a UTC creation timestamp."""
+    isolation._write_metadata(tmp_path, "docker.io/library/busybox:latest")
+
+    lines = (tmp_path / ".polythene-meta").read_text(encoding="utf-8").splitlines()
+    assert lines[0] == "image=docker.io/library/busybox:latest"
+    assert lines[1].startswith("created=")
+    assert lines[1].endswith("Z")
+
+
+def test_write_metadata_ignores_missing_destination(tmp_path: Path) -> None:
+    """Metadata is best-effort and never fails the export."""
+    isolation._write_metadata(tmp_path / "missing", "busybox")
+
+    assert not (tmp_path / "missing").exists()
+
+
+def _fake_tool(bin_dir: Path, name: str, body: str) -> None:
+    """Install an executable shell script ``name`` running ``body``."""
+    bin_dir.mkdir(exist_ok=True)
+    script = bin_dir / name
+    script.write_text(f"#!/bin/sh\n{body}\n", encoding="utf-8")
+    script.chmod(0o755)
+
+
+def test_export_rootfs_prefers_skopeo(tmp_path: Path) -> None:
+    """With skopeo and umoci installed the rootfs is unpacked without Podman."""
+    bin_dir = tmp_path / "bin"
+    _fake_tool(bin_dir, "skopeo", "exit 0")
+    # ``umoci unpack ... BUNDLE`` takes the bundle path as its last argument.
+    _fake_tool(
+        bin_dir,
+        "umoci",
+        'for arg; do bundle="$arg"; done; mkdir -p "$bundle/rootfs/bin"',
+    )
+    dest = tmp_path / "store" / "uuid-1"
+
+    with local.env(PATH=f"{bin_dir}:/usr/bin:/bin"):
+        isolation.export_rootfs("busybox", dest)
+
+    assert (dest / "bin").is_dir()
+    assert (dest / ".polythene-meta").is_file()
+    assert [p.name for p in dest.parent.iterdir()] == ["uuid-1"]
+
+
+def test_export_via_skopeo_reports_failure(tmp_path: Path) -> None:
+    """A failing copy leaves no destination so Podman can take over."""
+    bin_dir = tmp_path / "bin"
+    _fake_tool(bin_dir, "skopeo", "exit 1")
+    _fake_tool(bin_dir, "umoci", "exit 0")
+    dest = tmp_path / "store" / "uuid-1"
+
+    with local.env(PATH=f"{bin_dir}:/usr/bin:/bin"):
+        assert isolation._export_via_skopeo("busybox", dest) is False
+
+    assert not dest.exists()
+
+
+def test_export_via_skopeo_skipped_without_tools(tmp_path: Path) -> None:
+    """Missing tools select the Podman path without touching ``dest``."""
+    with local.env(PATH=(tmp_path / "empty").as_posix()):
+        assert isolation._export_via_skopeo("busybox", tmp_path / "dest") is False
+
+    assert not (tmp_path / "dest").exists()
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, []),
+        ("3", ["--image-parallel-copies", "3"]),
+        ("0", []),
+        ("many", []),
+    ],
+)
+def test_parallel_copy_args(
+    monkeypatch: pytest.MonkeyPatch, value: str | None, expected: list[str]
+) -> None:
+    """Only positive download limits are forwarded to skopeo."""
+    if value is None:
+        monkeypatch.delenv("POLYTHENE_MAX_CONCURRENT_DOWNLOADS", raising=False)
+    else:
+        monkeypatch.setenv("POLYTHENE_MAX_CONCURRENT_DOWNLOADS", value)
+
+    assert isolation._parallel_copy_args() == expected
+
+
+def test_prioritise_backends_moves_preference_first() -> None:
+    """The preferred backend leads while the others keep their order."""
+    bubblewrap = _DummyBackend(0, name="bubblewrap")
+    proot = _DummyBackend(0, name="proot")
+    chroot = _DummyBackend(0, name="chroot")
+    ordered = typ.cast("tuple[backends.Backend, ...]", (bubblewrap, proot, chroot))
+
+    assert isolation._prioritise_backends(ordered, "chroot") == (
+        chroot,
+        bubblewrap,
+        proot,
+    )
+    assert isolation._prioritise_backends(ordered, None) is ordered
+    assert isolation._prioritise_backends(ordered, "missing") is None
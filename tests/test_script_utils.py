@@ -5,6 +5,7 @@ from __future__ import annotations
 import typing as typ
 
 import pytest
+from plumbum import local
 
 from polythene import script_utils
 
@@ -51,3 +52,33 @@ def test_unique_match_errors_on_multiple(tmp_path: Path) -> None:
         script_utils.unique_match(files, description="file")
     assert isinstance(excinfo.value, SystemExit)
     assert excinfo.value.code == 2
+
+
+def test_get_command_is_memoised() -> None:
+    """Repeated lookups return the same resolved command object."""
+    assert script_utils.get_command("echo") is script_utils.get_command("echo")
+
+
+def test_find_command_shares_the_memo(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Optional lookups reuse a resolved command without walking ``PATH``."""
+    resolved = script_utils.get_command("echo")
+    monkeypatch.setattr(
+        local, "which", lambda _name: pytest.fail("PATH searched again")
+    )
+
+    assert script_utils.find_command("echo") is resolved
+
+
+def test_find_command_does_not_cache_misses(tmp_path: Path) -> None:
+    """Executables that appear on ``PATH`` later are found on the next lookup."""
+    with local.env(PATH=tmp_path.as_posix()):
+        assert script_utils.find_command("polythene-probe") is None
+
+    probe = tmp_path / "polythene-probe"
+    probe.write_text("#!/bin/sh\n", encoding="utf-8")
+    probe.chmod(0o755)
+    with local.env(PATH=tmp_path.as_posix()):
+        resolved = script_utils.find_command("polythene-probe")
+
+    assert resolved is not None
+    assert resolved.formulate() == [probe.as_posix()]
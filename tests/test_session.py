@@ -2,11 +2,13 @@
 
 from __future__ import annotations
 
+import sys
 import typing as typ
 
 import pytest
+from plumbum import local
 
-from polythene.session import PolytheneSession
+from polythene.session import PolytheneSession, _is_truthy
 
 if typ.TYPE_CHECKING:
     from pathlib import Path
@@ -64,37 +66,46 @@ def test_build_exec_argv_emits_split_isolation_flag(tmp_path: Path) -> None:
     assert all(not token.startswith("--isolation=") for token in argv)
 
 
-def test_session_defaults_to_proot_on_github(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
-) -> None:
-    """GitHub runners request ``proot`` to avoid noisy bwrap failures."""
-    monkeypatch.setenv("GITHUB_ACTIONS", "true")
+def test_build_exec_argv_omits_isolation_without_preference(tmp_path: Path) -> None:
+    """No isolation flag is emitted when neither argument nor env requests one."""
+    session = PolytheneSession(_RecordingSandbox(), store=tmp_path, env={})
 
-    sandbox = _RecordingSandbox()
-    session = PolytheneSession(sandbox, store=tmp_path)
+    argv = session._build_exec_argv("uuid-plain", ["true"], None)
 
-    session.run("uuid-2", "echo hi")
-
-    argv, _ = sandbox.calls[-1]
-    isolation_idx = argv.index("--isolation")
-    assert argv[isolation_idx + 1] == "proot"
-    assert "--isolation=proot" not in argv
+    assert argv[-3:] == [tmp_path.as_posix(), "--", "true"]
+    assert "--isolation" not in argv
 
 
-def test_session_respects_explicit_isolation_env(
-    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+@pytest.mark.parametrize(
+    ("env", "expected"),
+    [
+        ({"GITHUB_ACTIONS": "true"}, "proot"),
+        ({"POLYTHENE_ISOLATION": "chroot"}, "chroot"),
+        ({"GITHUB_ACTIONS": "true", "POLYTHENE_ISOLATION": "bubblewrap"}, "bubblewrap"),
+    ],
+    ids=["github-default", "explicit", "explicit-overrides-github"],
+)
+def test_session_selects_isolation_from_environment(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    env: dict[str, str],
+    expected: str,
 ) -> None:
-    """``POLYTHENE_ISOLATION`` overrides automatic backend selection."""
-    monkeypatch.setenv("POLYTHENE_ISOLATION", "chroot")
+    """``POLYTHENE_ISOLATION`` wins; GitHub runners otherwise request ``proot``."""
+    monkeypatch.delenv("GITHUB_ACTIONS", raising=False)
+    monkeypatch.delenv("POLYTHENE_ISOLATION", raising=False)
+    for key, value in env.items():
+        monkeypatch.setenv(key, value)
 
     sandbox = _RecordingSandbox()
     session = PolytheneSession(sandbox, store=tmp_path)
 
-    session.run("uuid-3", ["true"])
+    session.run("uuid-2", "echo hi")
 
     argv, _ = sandbox.calls[-1]
     isolation_idx = argv.index("--isolation")
-    assert argv[isolation_idx + 1] == "chroot"
+    assert argv[isolation_idx + 1] == expected
+    assert all(not token.startswith("--isolation=") for token in argv)
 
 
 def test_session_run_rejects_empty_command(tmp_path: Path) -> None:
@@ -126,3 +137,47 @@ def test_session_invalid_isolation_env(
 
     with pytest.raises(ValueError, match="Supported values"):
         session.run("uuid-6", ["true"])
+
+
+def test_session_import_avoids_cli_dependencies(tmp_path: Path) -> None:
+    """Sessions with an explicit store never load the CLI stack."""
+    probe = (
+        "import sys; from polythene import PolytheneSession; "
+        f"PolytheneSession(object(), store={tmp_path.as_posix()!r}); "
+        "print(sorted(m for m in ('cyclopts', 'plumbum') if m in sys.modules))"
+    )
+
+    output = local[sys.executable]["-c", probe]()
+
+    assert output.strip() == "[]"
+
+
+def test_session_snapshots_environment_at_construction(tmp_path: Path) -> None:
+    """Mutating the environment mapping after construction has no effect."""
+    env = {"GITHUB_ACTIONS": "true"}
+    session = PolytheneSession(_RecordingSandbox(), store=tmp_path, env=env)
+    env["POLYTHENE_ISOLATION"] = "chroot"
+
+    argv = session._build_exec_argv("uuid-7", ["true"], None)
+
+    isolation_idx = argv.index("--isolation")
+    assert argv[isolation_idx + 1] == "proot"
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (None, False),
+        ("", False),
+        ("0", False),
+        ("1", True),
+        ("true", True),
+        ("Yes", True),
+        ("ON", True),
+    ],
+)
+def test_is_truthy_accepts_case_insensitive_flags(
+    value: str | None, *, expected: bool
+) -> None:
+    """Flag parsing recognises the enabled spellings in any case."""
+    assert _is_truthy(value) is expected